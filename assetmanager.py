@@ -0,0 +1,234 @@
+import os
+import threading
+import weakref
+import pygame
+from collections import OrderedDict
+from functools import partial
+from settings import asset_memory_budget
+
+"""This file contains the asset manager, which owns every image, sound and animation and drops the least recently used ones when they take too much memory."""
+
+class AssetHandle:
+    """A handle to an asset owned by the asset manager.
+
+    The caches keep handles instead of the assets themselves and resolve them whenever an asset is requested, so the manager is the only one holding the assets.
+    """
+    def __init__(self, manager, key, build):
+        """Setup the handle.
+
+        Arguments:
+        manager -- the asset manager owning the asset
+        key -- the key of the asset
+        build -- the function which loads the asset and returns it with its size in bytes
+        """
+        self.manager = manager
+        self.key = key
+        self.build = build
+
+    def get(self):
+        """Return the asset, loading it again if it was evicted and nothing is using it anymore."""
+        return self.manager.get(self.key, self.build)
+
+    def evict(self):
+        """Evict the asset from the manager."""
+        self.manager.evict(self.key)
+
+class AssetManager:
+    """The asset manager, which shares each asset between everything using it.
+
+    The assets are kept in least recently used order, and the oldest ones are evicted when the bytes they hold exceed the memory budget.
+    An evicted asset is freed as soon as no sprite uses it anymore: until then it is only weakly referenced, so requesting it again hands back the same asset instead of loading a second copy.
+    Assets can be requested from the level loading thread, so the shared state is guarded by a lock, but the files are read from disk outside of it.
+    """
+    def __init__(self, budget):
+        """Setup the manager and its statistics.
+
+        Arguments:
+        budget -- the largest number of bytes the assets can hold before the least recently used ones are evicted
+        """
+        self.lock = threading.Lock()
+        self.budget = budget
+        self.assets = OrderedDict()  # The asset and its size in bytes, keyed by the asset key
+        self.evicted = {}  # The weak references to the evicted assets, their container type and their size in bytes
+        self.resident_bytes = 0
+        self.loads = 0
+        self.hits = 0
+        self.revivals = 0
+        self.evictions = 0
+
+    def handle(self, key, build):
+        """Return a handle to an asset, without loading it.
+
+        Arguments:
+        key -- the key of the asset
+        build -- the function which loads the asset and returns it with its size in bytes
+        """
+        return AssetHandle(self, key, build)
+
+    def image(self, path, mode='alpha'):
+        """Return the handle of an image.
+
+        Arguments:
+        path -- the image to load
+        mode -- 'alpha' (converted with per pixel alpha), 'opaque' (converted without alpha) or 'none' (left as loaded)
+        """
+        path = os.path.normpath(path)
+        return self.handle((path, mode), partial(self.load, path, mode))
+
+    def sound(self, path):
+        """Return the handle of a sound.
+
+        Arguments:
+        path -- the sound to load
+        """
+        path = os.path.normpath(path)
+        return self.handle((path, 'sound'), partial(self.load, path, 'sound'))
+
+    def load_image(self, path, mode='alpha'):
+        """Return an image, loading it only if it isn't loaded yet.
+
+        Arguments:
+        path -- the image to load
+        mode -- 'alpha' (converted with per pixel alpha), 'opaque' (converted without alpha) or 'none' (left as loaded)
+        """
+        return self.image(path, mode).get()
+
+    def load_sound(self, path):
+        """Return a sound, loading it only if it isn't loaded yet.
+
+        Arguments:
+        path -- the sound to load
+        """
+        return self.sound(path).get()
+
+    def get(self, key, build):
+        """Return an asset, loading it only if it isn't loaded yet, and evict the least recently used assets if the budget is exceeded.
+
+        Arguments:
+        key -- the key of the asset
+        build -- the function which loads the asset and returns it with its size in bytes
+        """
+        with self.lock:
+            if key in self.assets:
+                self.hits += 1
+                self.assets.move_to_end(key)
+                return self.assets[key][0]
+            asset, size = self.revive(key)
+            if asset is not None:
+                self.revivals += 1
+                self.insert(key, asset, size)
+                return asset
+        asset, size = build()
+        with self.lock:
+            # Another thread may have loaded the same asset in the meantime, in which case its copy is the shared one
+            if key in self.assets:
+                self.hits += 1
+                self.assets.move_to_end(key)
+                return self.assets[key][0]
+            self.loads += 1
+            self.insert(key, asset, size)
+            return asset
+
+    def insert(self, key, asset, size):
+        """Add an asset as the most recently used one, then evict the least recently used assets until the budget is met (must be called with the lock held).
+
+        Arguments:
+        key -- the key of the asset
+        asset -- the asset
+        size -- the size of the asset in bytes
+        """
+        self.assets[key] = (asset, size)
+        self.resident_bytes += size
+        # The asset just added is the most recent one, so it is never evicted
+        while self.resident_bytes > self.budget and len(self.assets) > 1:
+            evicted_key, (evicted_asset, evicted_size) = self.assets.popitem(last=False)
+            self.release(evicted_key, evicted_asset, evicted_size)
+
+    def evict(self, key):
+        """Evict an asset, if it is loaded.
+
+        Arguments:
+        key -- the key of the asset
+        """
+        with self.lock:
+            if key in self.assets:
+                asset, size = self.assets.pop(key)
+                self.release(key, asset, size)
+
+    def release(self, key, asset, size):
+        """Drop the reference to an evicted asset, keeping only weak references to it (must be called with the lock held).
+
+        Arguments:
+        key -- the key of the asset
+        asset -- the asset
+        size -- the size of the asset in bytes
+        """
+        self.resident_bytes -= size
+        self.evictions += 1
+        if isinstance(asset, (list, tuple)):
+            # Lists and tuples can't be weakly referenced, so their surfaces are referenced instead
+            self.evicted[key] = ([weakref.ref(item) for item in asset], type(asset), size)
+        else:
+            self.evicted[key] = (weakref.ref(asset), None, size)
+
+    def revive(self, key):
+        """Return an evicted asset which is still in use and its size in bytes, or (None, 0) if it was freed (must be called with the lock held).
+
+        Arguments:
+        key -- the key of the asset
+        """
+        if key not in self.evicted:
+            return None, 0
+        references, container, size = self.evicted.pop(key)
+        if container is None:
+            asset = references()
+        else:
+            items = [reference() for reference in references]
+            asset = None if None in items else container(items)
+        return asset, size
+
+    def load(self, path, mode):
+        """Load an asset from disk and return it with its size in bytes, without adding it to the manager.
+
+        Arguments:
+        path -- the file to load
+        mode -- 'alpha' or 'opaque' for an image converted with or without per pixel alpha, 'none' for an unconverted image, 'sound' for a sound
+        """
+        if mode == 'sound':
+            sound = pygame.mixer.Sound(path)
+            frequency, size, channels = pygame.mixer.get_init()
+            return sound, round(sound.get_length() * frequency) * channels * abs(size) // 8
+        image = pygame.image.load(path)
+        if mode == 'alpha':
+            image = image.convert_alpha()
+        elif mode == 'opaque':
+            image = image.convert()
+        return image, self.measure([image])
+
+    def measure(self, surfaces):
+        """Return the number of bytes held by the pixels of some surfaces.
+
+        Arguments:
+        surfaces -- the surfaces to measure
+        """
+        return sum(surface.get_bytesize() * surface.get_width() * surface.get_height() for surface in surfaces)
+
+    def get_stats(self):
+        """Return a dictionary with the manager statistics.
+
+        The evicted bytes are held by the evicted assets which are still in use, and are freed as soon as they aren't.
+        """
+        with self.lock:
+            evicted_bytes = 0
+            for key, (references, container, size) in list(self.evicted.items()):
+                if container is None:
+                    alive = references() is not None
+                else:
+                    alive = all(reference() is not None for reference in references)
+                if alive:
+                    evicted_bytes += size
+                else:
+                    del self.evicted[key]
+            return {'loads': self.loads, 'hits': self.hits, 'revivals': self.revivals, 'evictions': self.evictions, 'assets': len(self.assets), 'resident_bytes': self.resident_bytes, 'evicted_bytes': evicted_bytes, 'budget': self.budget}
+
+asset_manager = AssetManager(asset_memory_budget)
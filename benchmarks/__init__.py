@@ -0,0 +1,4 @@
+"""This package contains the benchmarks comparing the optimized code paths with the ones they replaced.
+
+Every benchmark must be run from the game folder, for example with 'python -m benchmarks.internal_terrain'.
+"""
@@ -0,0 +1,100 @@
+import os
+import time
+import pygame
+import misc
+from settings import screen_height, tile_size
+from tile import Tile
+from bundle import import_level_layouts
+from data import levels
+
+"""This file benchmarks the internal terrain detection on every level, comparing the old sprite-based path with the grid-based one."""
+
+def legacy_internal_terrain(terrain_sprites):
+    """Detect the internal terrain by checking every sprite against every other sprite and return a set with their (row, column) positions.
+
+    This is the detection 'Level.optimize_internal_terrain' used before it switched to the level grid.
+
+    Arguments:
+    terrain_sprites -- the group containing the terrain sprites
+    """
+    internal_tiles = set()
+    for target_tile in terrain_sprites.sprites():
+        topleft_tile = False
+        top_tile = False
+        topright_tile = False
+        left_tile = False
+        right_tile = False
+        bottomleft_tile = False
+        bottom_tile = False
+        bottomright_tile = False
+        for sprite in terrain_sprites.sprites():
+            if sprite.rect.collidepoint(target_tile.rect.topleft - pygame.Vector2(32, 32)):
+                topleft_tile = True
+            elif sprite.rect.collidepoint(target_tile.rect.midtop - pygame.Vector2(0, 32)):
+                top_tile = True
+            elif sprite.rect.collidepoint(target_tile.rect.topright - pygame.Vector2(-32, 32)):
+                topright_tile = True
+            elif sprite.rect.collidepoint(target_tile.rect.midleft - pygame.Vector2(32, 0)):
+                left_tile = True
+            elif sprite.rect.collidepoint(target_tile.rect.midright + pygame.Vector2(32, 0)):
+                right_tile = True
+            elif sprite.rect.collidepoint(target_tile.rect.bottomleft + pygame.Vector2(-32, 32)):
+                bottomleft_tile = True
+            elif sprite.rect.collidepoint(target_tile.rect.midbottom + pygame.Vector2(0, 32)):
+                bottom_tile = True
+            elif sprite.rect.collidepoint(target_tile.rect.bottomright + pygame.Vector2(32, 32)):
+                bottomright_tile = True
+        if topleft_tile and top_tile and topright_tile and left_tile and right_tile and bottomleft_tile and bottom_tile and bottomright_tile:
+            internal_tiles.add((target_tile.rect.y // tile_size, target_tile.rect.x // tile_size))
+        elif target_tile.rect.bottom == screen_height and topleft_tile and top_tile and topright_tile and left_tile and right_tile:
+            internal_tiles.add((target_tile.rect.y // tile_size, target_tile.rect.x // tile_size))
+    return internal_tiles
+
+def time_call(function, *args, repeat=5):
+    """Call a function several times and return its last result and its best time, measured in milliseconds.
+
+    Arguments:
+    function -- the function to call
+    args -- the arguments to pass to the function
+    repeat -- the number of calls
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = (time.perf_counter() - start) * 1000
+        if best is None or elapsed < best:
+            best = elapsed
+    return result, best
+
+def main():
+    """Run the benchmark on every level and print the results."""
+    bottom_row = screen_height // tile_size - 1
+    numpy = misc.numpy
+    for part in levels.values():
+        for subpart in part.values():
+            if not isinstance(subpart, dict):
+                continue
+            for level_data in subpart.values():
+                layout = import_level_layouts(level_data)['terrain']
+                terrain_sprites = pygame.sprite.Group()
+                for row_index, row in enumerate(layout):
+                    for col_index, col in enumerate(row):
+                        if col != -1:
+                            terrain_sprites.add(Tile(tile_size, col_index * tile_size, row_index * tile_size))
+                name = os.path.basename(level_data['bundle'])
+                legacy_tiles, legacy_time = time_call(legacy_internal_terrain, terrain_sprites, repeat=1)
+                misc.numpy = None
+                python_tiles, python_time = time_call(misc.find_internal_tiles, layout, bottom_row)
+                misc.numpy = numpy
+                results = [f"{name}: {len(terrain_sprites)} tiles, {len(legacy_tiles)} internal", f"legacy {legacy_time:.2f} ms", f"grid {python_time:.2f} ms"]
+                matches = python_tiles == legacy_tiles
+                if numpy is not None:
+                    numpy_tiles, numpy_time = time_call(misc.find_internal_tiles, layout, bottom_row)
+                    results.append(f"numpy {numpy_time:.2f} ms")
+                    matches = matches and numpy_tiles == legacy_tiles
+                results.append('match' if matches else 'MISMATCH')
+                print(' | '.join(results))
+
+if __name__ == '__main__':
+    main()
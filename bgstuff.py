@@ -2,6 +2,7 @@ import pygame
 import random
 from settings import *
 from tile import *
+from assetmanager import asset_manager
 
 """This file defines all the background elements."""
 
@@ -16,13 +17,13 @@ class Sky:
         """
         self.horizon = horizon
         if scene == 'day':
-            self.sky_top = pygame.image.load('./assets/level/sky/skytop_day.png').convert()
-            self.sky_middle = pygame.image.load('./assets/level/sky/skymiddle_day.png').convert()
-            self.sky_bottom = pygame.image.load('./assets/level/sky/skybottom_day.png').convert()
+            self.sky_top = asset_manager.load_image('./assets/level/sky/skytop_day.png', 'opaque')
+            self.sky_middle = asset_manager.load_image('./assets/level/sky/skymiddle_day.png', 'opaque')
+            self.sky_bottom = asset_manager.load_image('./assets/level/sky/skybottom_day.png', 'opaque')
         elif scene == 'night':
-            self.sky = pygame.image.load('./assets/level/sky/sky_night.png').convert()
+            self.sky = asset_manager.load_image('./assets/level/sky/sky_night.png', 'opaque')
             self.stars = pygame.sprite.Group()
-            star_surf = pygame.image.load('./assets/level/sky/star.png').convert()
+            star_surf = asset_manager.load_image('./assets/level/sky/star.png', 'opaque')
             star_number = [random.randint(0, 10*(self.horizon-row)) for row in range(self.horizon)]
             for index, num in enumerate(star_number):
                 for _ in range(num):
@@ -31,13 +32,13 @@ class Sky:
                     sprite = StaticTile(0, x, y, star_surf)
                     self.stars.add(sprite)
         elif scene == 'dawn':
-            self.sky_top = pygame.image.load('./assets/level/sky/skytop_dawn.png').convert()
-            self.sky_middle = pygame.image.load('./assets/level/sky/skymiddle_dawn.png').convert()
-            self.sky_bottom = pygame.image.load('./assets/level/sky/skybottom_dawn.png').convert()
+            self.sky_top = asset_manager.load_image('./assets/level/sky/skytop_dawn.png', 'opaque')
+            self.sky_middle = asset_manager.load_image('./assets/level/sky/skymiddle_dawn.png', 'opaque')
+            self.sky_bottom = asset_manager.load_image('./assets/level/sky/skybottom_dawn.png', 'opaque')
         elif scene == 'dusk':
-            self.sky_top = pygame.image.load('./assets/level/sky/skytop_dusk.png').convert()
-            self.sky_middle = pygame.image.load('./assets/level/sky/skymiddle_dusk.png').convert()
-            self.sky_bottom = pygame.image.load('./assets/level/sky/skybottom_dusk.png').convert()
+            self.sky_top = asset_manager.load_image('./assets/level/sky/skytop_dusk.png', 'opaque')
+            self.sky_middle = asset_manager.load_image('./assets/level/sky/skymiddle_dusk.png', 'opaque')
+            self.sky_bottom = asset_manager.load_image('./assets/level/sky/skybottom_dusk.png', 'opaque')
 
     def draw(self, display_surface, scene):
         """Draw the sky tiles to screen based on their height.
@@ -79,7 +80,7 @@ class Water:
             path = './assets/level/water/dawn_dusk'
         if generate:
             water_start = -screen_width
-            water_width = pygame.image.load('./assets/level/water/day/water1.png').get_width()
+            water_width = asset_manager.load_image('./assets/level/water/day/water1.png').get_width()
             water_x_tiles = int((level_width + 2 * screen_width) / water_width)
             for tile in range(water_x_tiles):
                 x = tile * water_width + water_start
@@ -87,16 +88,24 @@ class Water:
                 sprite = AnimatedTile(water_width, x, y, path)
                 self.water_sprites.add(sprite)
 
-    def draw(self, display_surface, shift, delta):
+    def draw(self, display_surface, camera, delta):
         """Draw the water tiles to screen.
 
         Arguments:
         display_surface -- the screen
-        shift -- the camera shift
+        camera -- the level camera
         delta -- the time delta
         """
-        self.water_sprites.update(shift, delta)
-        self.water_sprites.draw(display_surface)
+        if not self.water_sprites:
+            return
+        # Only the water on screen is animated, copying the frame of the first tile so that every tile stays in step
+        leader = self.water_sprites.sprites()[0]
+        leader.update(delta)
+        visible = camera.get_visible(self.water_sprites, True)
+        for sprite in visible:
+            sprite.frame_index = leader.frame_index
+            sprite.image = leader.image
+        camera.draw(self.water_sprites, display_surface, True, visible)
 
 class Clouds:
     """This class defines the clouds."""
@@ -136,33 +145,36 @@ class Clouds:
         for _ in range(cloud_number):
             x = random.randrange(cloud_start, cloud_stop, 8)
             y = random.randrange(min_y, max_y, 16)
-            cloud_surf = pygame.image.load(random.choice(clouds)).convert_alpha()
+            cloud_surf = asset_manager.load_image(random.choice(clouds))
             sprite = StaticTile(0, x, y, cloud_surf)
             sprite.cooldown = random.randrange(300, 1500, 300)
             sprite.speed = random.randrange(1, 8)
             sprite.ticks = pygame.time.get_ticks()
             self.cloud_sprites.add(sprite)
 
-    def move(self):
-        """Move the clouds from right to left based on their speed and countdown values."""
+    def move(self, camera):
+        """Move the clouds from right to left based on their speed and countdown values.
+
+        Arguments:
+        camera -- the level camera
+        """
         for sprite in self.cloud_sprites.sprites():
             now = pygame.time.get_ticks()
             if now - sprite.ticks >= sprite.cooldown:
                 sprite.ticks = now
                 sprite.rect.x -= sprite.speed
-                if sprite.rect.x < -screen_width:
-                    sprite.rect.x = self.level_width + screen_width
+                if sprite.rect.x - camera.background_x < -screen_width:
+                    sprite.rect.x = self.level_width + screen_width + camera.background_x
 
-    def draw(self, display_surface, shift):
+    def draw(self, display_surface, camera):
         """Draw the clouds to screen.
 
         Arguments:
         display_surface -- the screen
-        shift -- the camera shift
+        camera -- the level camera
         """
-        self.move()
-        self.cloud_sprites.update(shift)
-        self.cloud_sprites.draw(display_surface)
+        self.move(camera)
+        camera.draw(self.cloud_sprites, display_surface, True)
 
 class Mountains:
     """This class defines the mountains in the background."""
@@ -183,7 +195,7 @@ class Mountains:
         elif scene == 'dawn' or scene == 'dusk':
             path = './assets/level/ground/mountain_dawn_dusk.png'
         if generate:
-            mountain_surf = pygame.image.load(path).convert_alpha()
+            mountain_surf = asset_manager.load_image(path)
             mountain_start = -screen_width
             mountain_width = mountain_surf.get_width()
             mountain_x_tiles = int((level_width + 2 * screen_width) / mountain_width)
@@ -193,12 +205,11 @@ class Mountains:
                 sprite = StaticTile(0, x, y, mountain_surf)
                 self.mountain_sprites.add(sprite)
 
-    def draw(self, display_surface, shift):
+    def draw(self, display_surface, camera):
         """Draw the mountains to screen.
 
         Arguments:
         display_surface -- the screen
-        shift -- the camera shift
+        camera -- the level camera
         """
-        self.mountain_sprites.update(shift)
-        self.mountain_sprites.draw(display_surface)
+        camera.draw(self.mountain_sprites, display_surface, True)
@@ -1,6 +1,8 @@
 import pygame
 from text import render
+from fonts import font_registry, render_cache
 from settings import controllers
+from assetmanager import asset_manager
 
 """This file defines all user interaction boxes."""
 
@@ -19,16 +21,16 @@ class TextBox:
         self.parent = parent
         self.controllers = self.parent.controller.controllers
         self.gamepad = self.parent.gamepad
-        self.outline = pygame.image.load(outline).convert_alpha()
+        self.outline = asset_manager.load_image(outline)
         self.outline_rect = self.outline.get_rect(center=self.display_surface.get_rect().center)
         self.input_box_topleft = self.outline_rect.topleft + pygame.Vector2(27, 67)
-        self.font = pygame.font.Font('./font.ttf', 48)
+        self.font = font_registry.get('./font.ttf', 48)
         self.now = 0  # This is a dummy value
         self.gen_time = pygame.time.get_ticks()
         self.text = ''
 
         # SFX
-        self.menu_sfx = pygame.mixer.Sound('./assets/audio/sfx/menu_select.ogg')
+        self.menu_sfx = asset_manager.load_sound('./assets/audio/sfx/menu_select.ogg')
 
     def get_input(self, func):
         """Get the input from the devices.
@@ -58,7 +60,7 @@ class TextBox:
 
     def display_text(self):
         """Display the input text."""
-        text_surface = self.font.render(self.text, False, 'white')
+        text_surface = render_cache.render(self.font, self.text, False, 'white')
         self.display_surface.blit(text_surface, self.input_box_topleft)
 
     def run(self, func):
@@ -88,13 +90,13 @@ class SelectionBox:
         self.parent = parent
         self.controllers = self.parent.controller.controllers
         self.gamepad = self.parent.gamepad
-        self.outline = pygame.image.load(outline).convert_alpha()
+        self.outline = asset_manager.load_image(outline)
         self.outline_rect = self.outline.get_rect(midbottom=(self.display_surface.get_rect().centerx, self.display_surface.get_rect().bottom-54))
         self.textbox_topleft = self.outline_rect.midleft + pygame.Vector2(16, 16)
         self.textbox_rect = pygame.Rect(self.textbox_topleft, self.outline_rect.size - pygame.Vector2(32, 32))
-        self.font = pygame.font.Font('./font.ttf', 24)
-        self.selection_font = pygame.font.Font('./font.ttf', 40)
-        self.cursor = pygame.image.load('./assets/menu/cursor.png').convert_alpha()
+        self.font = font_registry.get('./font.ttf', 24)
+        self.selection_font = font_registry.get('./font.ttf', 40)
+        self.cursor = asset_manager.load_image('./assets/menu/cursor.png')
         self.cursor_pos = 0
         self.now = 0  # This is a dummy value
         self.gen_time = pygame.time.get_ticks()
@@ -102,7 +104,7 @@ class SelectionBox:
         self.y = 32
 
         # SFX
-        self.menu_sfx = pygame.mixer.Sound('./assets/audio/sfx/menu_select.ogg')
+        self.menu_sfx = asset_manager.load_sound('./assets/audio/sfx/menu_select.ogg')
 
         # Input initialization
         self.keydown_up = False
@@ -127,7 +129,7 @@ class SelectionBox:
         x = self.outline_rect.left + self.x
         y = self.outline_rect.top + self.y
         for option in options:
-            option_surface = self.selection_font.render(option, False, 'white')
+            option_surface = render_cache.render(self.selection_font, option, False, 'white')
             self.display_surface.blit(option_surface, (x, y))
             y += 64
 
@@ -147,7 +149,7 @@ class SelectionBox:
             if small: step = 24
             else: step = 32
             for string in text:
-                string_surface = self.font.render(string, False, 'white')
+                string_surface = render_cache.render(self.font, string, False, 'white')
                 self.display_surface.blit(string_surface, (self.textbox_rect.left, y))
                 y += step
 
@@ -0,0 +1,226 @@
+import os
+import sys
+import struct
+import xml.etree.ElementTree as ElementTree
+from array import array
+from misc import import_csv_layout
+
+"""This file contains the level loaders and the level compiler, which packs all the layers of a level into a single binary bundle.
+
+Levels are read from their Tiled map when 'data.py' gives one, and from their CSV data layers otherwise.
+Layers without any tile are returned as None, so that no sprite is created for them.
+A bundle starts with a small header (magic, format version, layer count, width and height, followed by the layer names)
+and then stores every layer as a grid of little-endian int16 values, where -1 marks an empty cell.
+Running this file directly compiles the bundles of every level listed in 'data.py'.
+"""
+
+magic = b'TBLB'
+bundle_version = 1
+layer_names = ('barriers', 'terrain', 'background', 'buildings', 'roofs', 'decoration', 'roots', 'grass', 'energy', 'trees', 'enemies', 'borders', 'setup')
+
+def _convert_layout(layout):
+    """Convert a CSV layout made of strings into a layout made of integers and return it.
+
+    Tiled exports flipped tiles as their flag bits minus the tileset offset, so the flag bits are masked away.
+
+    Arguments:
+    layout -- the layout to convert
+    """
+    converted_layout = []
+    for row in layout:
+        converted_row = array('h')
+        for col in row:
+            value = int(col)
+            if value < -1:
+                value &= 0x1FFFFFFF
+            converted_row.append(value)
+        converted_layout.append(converted_row)
+    return converted_layout
+
+def import_csv_layouts(level_data):
+    """Read every CSV data layer of a level and return a dictionary with their integer layouts.
+
+    Arguments:
+    level_data -- the level data, as defined in 'data.py'
+    """
+    layouts = {}
+    for name in layer_names:
+        layout = _convert_layout(import_csv_layout(level_data[name]))
+        layouts[name] = layout if any(col != -1 for row in layout for col in row) else None
+    return layouts
+
+def import_source_layouts(level_data):
+    """Read the layouts of a level from its Tiled map or, if it doesn't have one, from its CSV data layers.
+
+    Arguments:
+    level_data -- the level data, as defined in 'data.py'
+    """
+    if 'map' in level_data:
+        return import_tmx_layouts(level_data['map'])
+    return import_csv_layouts(level_data)
+
+def import_tmx_layouts(path):
+    """Read every layer of a Tiled map in a single pass and return a dictionary with their integer layouts.
+
+    Global tile IDs are converted to the IDs local to their tileset using the 'firstgid' offsets listed in the map.
+    Layers missing from the map are returned as empty layers.
+
+    Arguments:
+    path -- the Tiled map to import
+    """
+    root = ElementTree.parse(path).getroot()
+    width = int(root.get('width'))
+    height = int(root.get('height'))
+    first_gids = sorted(int(tileset.get('firstgid')) for tileset in root.iter('tileset'))
+    offsets = {}
+    layouts = dict.fromkeys(layer_names)
+    for layer in root.iter('layer'):
+        name = layer.get('name')
+        if name not in layouts:
+            continue
+        data = layer.find('data')
+        if data.get('encoding') != 'csv':
+            raise ValueError(f"The '{name}' layer of '{path}' isn't encoded as CSV.")
+        layout = []
+        empty = True
+        for line in data.text.split():
+            row = array('h')
+            for col in line.rstrip(',').split(','):
+                gid = int(col) & 0x1FFFFFFF  # Strip the flip flags
+                if gid == 0:
+                    row.append(-1)
+                    continue
+                if gid not in offsets:
+                    offsets[gid] = max(first_gid for first_gid in first_gids if first_gid <= gid)
+                row.append(gid - offsets[gid])
+                empty = False
+            layout.append(row)
+        if len(layout) != height or any(len(row) != width for row in layout):
+            raise ValueError(f"The '{name}' layer of '{path}' doesn't match the size of the map.")
+        if not empty:
+            layouts[name] = layout
+    return layouts
+
+def _empty_layout(width, height):
+    """Return a layout with no tiles.
+
+    Arguments:
+    width -- the width of the layout, measured in tiles
+    height -- the height of the layout, measured in tiles
+    """
+    return [array('h', [-1]) * width for _ in range(height)]
+
+def _get_size(layouts):
+    """Return the width and the height of the non-empty layers of a level, measured in tiles.
+
+    Arguments:
+    layouts -- the layouts of the level
+    """
+    for layout in layouts.values():
+        if layout is not None:
+            return len(layout[0]), len(layout)
+    raise ValueError("The level doesn't have any tile.")
+
+def compile_level(level_data, layouts=None):
+    """Pack all the layers of a level into its bundle.
+
+    Arguments:
+    level_data -- the level data, as defined in 'data.py'
+    layouts -- the already parsed layouts (if None, the level is read from its sources)
+    """
+    if layouts is None:
+        layouts = import_source_layouts(level_data)
+    width, height = _get_size(layouts)
+    layouts = {name: _empty_layout(width, height) if layout is None else layout for name, layout in layouts.items()}
+    header = struct.pack('<4sHHHH', magic, bundle_version, len(layer_names), width, height)
+    for name in layer_names:
+        if len(layouts[name]) != height or any(len(row) != width for row in layouts[name]):
+            raise ValueError(f"The '{name}' layer of '{level_data['bundle']}' doesn't match the size of the other layers.")
+        header += struct.pack('<B', len(name)) + name.encode('ascii')
+    grids = array('h')
+    for name in layer_names:
+        for row in layouts[name]:
+            grids.extend(row)
+    if sys.byteorder == 'big':
+        grids.byteswap()
+    temp_path = level_data['bundle'] + '.tmp'
+    with open(temp_path, 'wb') as bundle:
+        bundle.write(header)
+        bundle.write(grids.tobytes())
+    os.replace(temp_path, level_data['bundle'])
+
+def _is_stale(level_data):
+    """Return whether the bundle of a level is missing or older than any of its sources.
+
+    Arguments:
+    level_data -- the level data, as defined in 'data.py'
+    """
+    try:
+        bundle_time = os.stat(level_data['bundle']).st_mtime_ns
+        sources = [level_data['map']] if 'map' in level_data else [level_data[name] for name in layer_names]
+        return any(os.stat(source).st_mtime_ns > bundle_time for source in sources)
+    except FileNotFoundError:
+        return True
+
+def load_bundle(path):
+    """Read a bundle and return a dictionary with its layouts, or None if the bundle can't be used.
+
+    Arguments:
+    path -- the bundle to read
+    """
+    with open(path, 'rb') as bundle:
+        data = bundle.read()
+    header_size = struct.calcsize('<4sHHHH')
+    if len(data) < header_size:
+        return None
+    bundle_magic, version, layer_count, width, height = struct.unpack_from('<4sHHHH', data)
+    if bundle_magic != magic or version != bundle_version:
+        return None
+    offset = header_size
+    names = []
+    for _ in range(layer_count):
+        name_length = data[offset]
+        names.append(data[offset+1:offset+1+name_length].decode('ascii'))
+        offset += 1 + name_length
+    if set(names) != set(layer_names) or len(data) - offset != 2 * layer_count * width * height:
+        return None
+    grids = array('h')
+    grids.frombytes(data[offset:])
+    if sys.byteorder == 'big':
+        grids.byteswap()
+    layouts = {}
+    for index, name in enumerate(names):
+        start = index * width * height
+        if grids[start:start+width*height].count(-1) == width * height:
+            layouts[name] = None
+        else:
+            layouts[name] = [grids[start+row*width:start+(row+1)*width] for row in range(height)]
+    return layouts
+
+def import_level_layouts(level_data):
+    """Return a dictionary with all the layouts of a level, falling back to its sources if the bundle is missing or stale.
+
+    When falling back, the bundle is compiled again so that the next load only reads one file.
+
+    Arguments:
+    level_data -- the level data, as defined in 'data.py'
+    """
+    if not _is_stale(level_data):
+        layouts = load_bundle(level_data['bundle'])
+        if layouts is not None:
+            return layouts
+    layouts = import_source_layouts(level_data)
+    try:
+        compile_level(level_data, layouts)
+    except OSError:
+        pass  # The bundle is only an optimization, so a read-only game folder is fine
+    return layouts
+
+if __name__ == '__main__':
+    from data import levels
+    for part in levels.values():
+        for subpart in part.values():
+            if isinstance(subpart, dict):
+                for level_data in subpart.values():
+                    compile_level(level_data)
+                    print(f"Compiled '{level_data['bundle']}'")
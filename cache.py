@@ -0,0 +1,299 @@
+import os
+import threading
+import pygame
+from functools import partial
+from misc import import_folder, import_sliced_graphics
+from assetmanager import asset_manager
+
+"""This file contains the caches used to share graphics between sprites."""
+
+tile_atlases = {'terrain': 'ground', 'background': 'bg', 'roofs': 'roofs', 'grass': 'grass'}
+
+class AtlasCache:
+    """The tile atlas cache, which slices each atlas once and shares its tiles between all the sprites using it.
+
+    The slices are owned by the asset manager, so the cache only keeps their handles.
+    The cache can be filled from the level loading thread, so every access is guarded by a lock.
+    """
+    def __init__(self):
+        """Setup the cache and its statistics."""
+        self.lock = threading.Lock()
+        self.atlases = {}  # The handles of the sliced atlases, keyed by (path, scene)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path, scene):
+        """Return the tiles sliced from an atlas, slicing it only if it isn't loaded yet.
+
+        Arguments:
+        path -- the image atlas to slice
+        scene -- the scene the atlas belongs to
+        """
+        key = (path, scene)
+        with self.lock:
+            if key in self.atlases:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self.atlases[key] = asset_manager.handle(('atlas', os.path.normpath(path)), partial(self.build, path))
+            handle = self.atlases[key]
+        return handle.get()
+
+    def contains(self, path, scene):
+        """Return whether an atlas is in the cache.
+
+        Arguments:
+        path -- the image atlas
+        scene -- the scene the atlas belongs to
+        """
+        with self.lock:
+            return (path, scene) in self.atlases
+
+    def build(self, path):
+        """Slice an atlas and return the slices with the size in bytes of the atlas they share.
+
+        Arguments:
+        path -- the image atlas to slice
+        """
+        slices = import_sliced_graphics(path)
+        return slices, asset_manager.measure([slices[0].get_abs_parent()]) if slices else 0
+
+    def evict(self, scene=None):
+        """Remove the atlases of a scene from the cache.
+
+        Arguments:
+        scene -- the scene to evict (if None, every atlas is evicted)
+        """
+        with self.lock:
+            keys = [key for key in self.atlases if scene is None or key[1] == scene]
+        self.discard(keys)
+
+    def discard(self, keys):
+        """Remove some atlases from the cache.
+
+        Arguments:
+        keys -- the (path, scene) keys of the atlases
+        """
+        with self.lock:
+            for key in keys:
+                if key in self.atlases:
+                    self.atlases.pop(key).evict()
+
+    def switch_scene(self, scene):
+        """Evict the atlases of every scene except the one being switched to.
+
+        Arguments:
+        scene -- the scene to keep
+        """
+        with self.lock:
+            scenes = {key[1] for key in self.atlases if key[1] != scene}
+        for other_scene in scenes:
+            self.evict(other_scene)
+
+    def get_stats(self):
+        """Return a dictionary with the cache statistics."""
+        return {'hits': self.hits, 'misses': self.misses, 'atlases': len(self.atlases)}
+
+
+class FrameStore:
+    """The animation frame store, which imports each animation folder once and shares its frames between all the sprites using it.
+
+    The frames are handed out as tuples, so no sprite can change the frames the others are using.
+    The frames are owned by the asset manager, so the store only keeps their handles.
+    The store can be filled from the level loading thread, so every access is guarded by a lock.
+    """
+    def __init__(self):
+        """Setup the store and its statistics."""
+        self.lock = threading.Lock()
+        self.frames = {}  # The handles of the animations, keyed by folder
+        self.scenes = {}  # The scene of every animation drawn for a single scene, keyed by folder
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path, scene=None):
+        """Return the frames of an animation folder, importing them only if they aren't loaded yet.
+
+        Arguments:
+        path -- the animation folder
+        scene -- the scene the animation is drawn for (if None, the animation is used in every scene)
+        """
+        with self.lock:
+            if scene is not None:
+                self.scenes[path] = scene
+            if path in self.frames:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self.frames[path] = asset_manager.handle(('frames', os.path.normpath(path)), partial(self.build, path))
+            handle = self.frames[path]
+        return handle.get()
+
+    def build(self, path):
+        """Import the frames of an animation folder and return them with their size in bytes.
+
+        Arguments:
+        path -- the animation folder
+        """
+        frames = tuple(import_folder(path))
+        return frames, asset_manager.measure(frames)
+
+    def contains(self, path):
+        """Return whether an animation folder is in the store.
+
+        Arguments:
+        path -- the animation folder
+        """
+        with self.lock:
+            return path in self.frames
+
+    def discard(self, paths):
+        """Remove some animations from the store.
+
+        Arguments:
+        paths -- the animation folders
+        """
+        with self.lock:
+            for path in paths:
+                if path in self.frames:
+                    self.frames.pop(path).evict()
+                self.scenes.pop(path, None)
+
+    def switch_scene(self, scene):
+        """Remove the animations drawn for every scene except the one being switched to and return their folders.
+
+        Arguments:
+        scene -- the scene to keep
+        """
+        with self.lock:
+            paths = [path for path, path_scene in self.scenes.items() if path_scene != scene]
+        self.discard(paths)
+        return paths
+
+    def clear(self):
+        """Remove every animation from the store."""
+        with self.lock:
+            for handle in self.frames.values():
+                handle.evict()
+            self.frames.clear()
+            self.scenes.clear()
+
+    def get_stats(self):
+        """Return a dictionary with the store statistics."""
+        return {'hits': self.hits, 'misses': self.misses, 'animations': len(self.frames)}
+
+class MirrorCache:
+    """The mirrored frame cache, which flips the frames of each animation folder once so that sprites facing left can share them.
+
+    The frames are only read from the cache, so any sprite which can face both ways can use it.
+    The flipped frames are owned by the asset manager, so the cache only keeps their keys: a handle would keep the frames it flips alive.
+    """
+    def __init__(self):
+        """Setup the cache and its statistics."""
+        self.lock = threading.Lock()
+        self.keys = {}  # The asset keys of the flipped animations, keyed by folder
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path, frames):
+        """Return the horizontally flipped frames of an animation folder, flipping them only if they aren't loaded yet.
+
+        Arguments:
+        path -- the folder the frames were imported from
+        frames -- the frames to flip
+        """
+        with self.lock:
+            if path in self.keys:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self.keys[path] = ('mirror', os.path.normpath(path))
+            key = self.keys[path]
+        return asset_manager.get(key, partial(self.build, frames))
+
+    def build(self, frames):
+        """Flip some frames and return them with their size in bytes.
+
+        Arguments:
+        frames -- the frames to flip
+        """
+        flipped = [pygame.transform.flip(frame, True, False) for frame in frames]
+        return flipped, asset_manager.measure(flipped)
+
+    def discard(self, paths):
+        """Remove the mirrored frames of some animation folders from the cache.
+
+        Arguments:
+        paths -- the animation folders
+        """
+        with self.lock:
+            for path in paths:
+                if path in self.keys:
+                    asset_manager.evict(self.keys.pop(path))
+
+    def clear(self):
+        """Remove every mirrored animation from the cache."""
+        with self.lock:
+            for key in self.keys.values():
+                asset_manager.evict(key)
+            self.keys.clear()
+
+    def get_stats(self):
+        """Return a dictionary with the cache statistics."""
+        return {'hits': self.hits, 'misses': self.misses, 'animations': len(self.keys)}
+
+class ImageCache:
+    """The image cache, which loads each single image once in each facing so that the sprites spawned during the game don't read it from disk.
+
+    The images are owned by the asset manager, so the cache only keeps their handles.
+    """
+    def __init__(self):
+        """Setup the cache and its statistics."""
+        self.lock = threading.Lock()
+        self.images = {}  # The handles of the images, keyed by (path, flipped)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path, flipped=False):
+        """Return an image, loading or flipping it only if it isn't loaded yet.
+
+        Arguments:
+        path -- the image to load
+        flipped -- if this flag is set to True, the horizontally flipped image is returned
+        """
+        key = (path, flipped)
+        with self.lock:
+            if key in self.images:
+                self.hits += 1
+            else:
+                self.misses += 1
+                if flipped:
+                    self.images[key] = asset_manager.handle(('flipped', os.path.normpath(path)), partial(self.build, path))
+                else:
+                    self.images[key] = asset_manager.image(path)
+            handle = self.images[key]
+        return handle.get()
+
+    def build(self, path):
+        """Flip an image and return it with its size in bytes.
+
+        Arguments:
+        path -- the image to flip
+        """
+        image = pygame.transform.flip(self.get(path), True, False)
+        return image, asset_manager.measure([image])
+
+    def clear(self):
+        """Remove every image from the cache."""
+        with self.lock:
+            for handle in self.images.values():
+                handle.evict()
+            self.images.clear()
+
+    def get_stats(self):
+        """Return a dictionary with the cache statistics."""
+        return {'hits': self.hits, 'misses': self.misses, 'images': len(self.images)}
+
+atlas_cache = AtlasCache()
+frame_store = FrameStore()
+mirror_cache = MirrorCache()
+image_cache = ImageCache()
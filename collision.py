@@ -0,0 +1,179 @@
+import bisect
+import math
+import pygame
+
+"""This file contains the collision grid and the patrol map, which index the solid tiles and the enemy borders by the level cells they cover."""
+
+def get_cells(rect, cell_size):
+    """Yield the (row, column) positions of the grid cells overlapped by a rect.
+
+    Arguments:
+    rect -- the rect to check
+    cell_size -- the size of each cell
+    """
+    for row in range(rect.top // cell_size, (rect.bottom - 1) // cell_size + 1):
+        for col in range(rect.left // cell_size, (rect.right - 1) // cell_size + 1):
+            yield (row, col)
+
+class CollisionGrid:
+    """The collision grid, which is built once when the level is loaded so that a rect is only tested against the tiles in the cells it overlaps.
+
+    Every tile keeps the position it had in the groups the grid was built from, so the collisions are always found in that same order.
+    """
+    def __init__(self, groups, cell_size):
+        """Setup the grid and index the tiles.
+
+        Arguments:
+        groups -- the groups containing the solid tiles, in the order they are checked in
+        cell_size -- the size of each cell
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+        index = 0
+        for group in groups:
+            for sprite in group.sprites():
+                for cell in get_cells(sprite.rect, self.cell_size):
+                    self.cells.setdefault(cell, []).append((index, sprite))
+                index += 1
+
+    def collide(self, rect):
+        """Yield the tiles colliding with a rect, in the order they were indexed in.
+
+        The rect is checked again after every tile, so it can be moved out of a tile before the next one is found.
+
+        Arguments:
+        rect -- the rect to check
+        """
+        last_index = -1
+        while True:
+            hit = None
+            for cell in get_cells(rect, self.cell_size):
+                for index, sprite in self.cells.get(cell, ()):
+                    if index > last_index and (hit is None or index < hit[0]) and sprite.rect.colliderect(rect):
+                        hit = (index, sprite)
+            if hit is None:
+                return
+            last_index = hit[0]
+            yield hit[1]
+
+    def sweep(self, rect, start):
+        """Return the first tile hit by a rect moving in a straight line to its current position, or None if it didn't hit any tile.
+
+        The cells are visited by stepping the center of the rect through the grid one cell boundary at a time (DDA), so only the cells crossed by the rect are checked and a fast rect can't skip a thin wall between two frames.
+        The tiles are tested against the bounding box of the whole movement, which is exact for horizontal and vertical movements.
+
+        Arguments:
+        rect -- the rect, at its current position
+        start -- the top left position the rect moved from
+        """
+        start_rect = rect.copy()
+        start_rect.topleft = start
+        swept_rect = start_rect.union(rect)
+        x, y = start_rect.center
+        dx, dy = rect.centerx - x, rect.centery - y
+        col, row = x // self.cell_size, y // self.cell_size
+        end_col, end_row = rect.centerx // self.cell_size, rect.centery // self.cell_size
+        step_col = 1 if dx > 0 else -1
+        step_row = 1 if dy > 0 else -1
+        # The fraction of the movement after which the center crosses the next column and row boundaries
+        next_col = ((col + (step_col > 0)) * self.cell_size - x) / dx if dx else float('inf')
+        next_row = ((row + (step_row > 0)) * self.cell_size - y) / dy if dy else float('inf')
+        col_fraction = self.cell_size / abs(dx) if dx else float('inf')
+        row_fraction = self.cell_size / abs(dy) if dy else float('inf')
+        checked = set()
+        for _ in range(abs(end_col - col) + abs(end_row - row) + 1):
+            # Every cell the rect can overlap while its center is inside the current cell
+            area = pygame.Rect(col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size).inflate(rect.width + 2, rect.height + 2)
+            hit = None
+            for cell in get_cells(area, self.cell_size):
+                if cell not in checked:
+                    checked.add(cell)
+                    for index, sprite in self.cells.get(cell, ()):
+                        if (hit is None or index < hit[0]) and sprite.rect.colliderect(swept_rect):
+                            hit = (index, sprite)
+            if hit is not None:
+                return hit[1]
+            if row == end_row or (col != end_col and next_col < next_row):
+                col += step_col
+                next_col += col_fraction
+            else:
+                row += step_row
+                next_row += row_fraction
+        return None
+
+class PatrolMap:
+    """The patrol map, which compiles the enemy borders into the intervals enemies patrol between when the level is loaded.
+
+    Enemies only move horizontally, so every enemy keeps the interval between the borders on its rows and only looks the borders up again when it leaves it.
+    """
+    def __init__(self, layout, cell_size):
+        """Setup the border columns of every row and the border edges.
+
+        Arguments:
+        layout -- the borders layout (None for an empty layer)
+        cell_size -- the size of each cell
+        """
+        self.cell_size = cell_size
+        self.rows = {}
+        self.cells = set()
+        self.left_edges = set()
+        self.right_edges = set()
+        if layout is not None:
+            for row_index, row in enumerate(layout):
+                columns = [col_index for col_index, col in enumerate(row) if col != -1]
+                if columns:
+                    self.rows[row_index] = columns
+                for col_index in columns:
+                    self.cells.add((row_index, col_index))
+                    self.left_edges.add(col_index * cell_size)
+                    self.right_edges.add((col_index + 1) * cell_size)
+
+    def get_columns(self, rect):
+        """Return a sorted list with the columns of the borders on the rows overlapped by a rect.
+
+        Arguments:
+        rect -- the rect to check
+        """
+        columns = set()
+        for row in range(rect.top // self.cell_size, (rect.bottom - 1) // self.cell_size + 1):
+            columns.update(self.rows.get(row, ()))
+        return sorted(columns)
+
+    def get_patrol(self, rect):
+        """Return the (left, right) limits of the interval between the borders around a rect.
+
+        If the rect overlaps a border, it is outside its own interval until it leaves the border.
+
+        Arguments:
+        rect -- the rect to check
+        """
+        columns = self.get_columns(rect)
+        index = bisect.bisect_right(columns, (rect.left - self.cell_size) // self.cell_size)
+        left = (columns[index-1] + 1) * self.cell_size if index > 0 else -math.inf
+        right = columns[index] * self.cell_size if index < len(columns) else math.inf
+        return (left, right)
+
+    def collide(self, rect):
+        """Return whether a rect overlaps a border.
+
+        Arguments:
+        rect -- the rect to check
+        """
+        return any(cell in self.cells for cell in get_cells(rect, self.cell_size))
+
+    def in_deadzone(self, rect, distance):
+        """Return whether the left side of a rect is near the right side of any border or its right side is near the left side of any border.
+
+        The borders are checked on every row, as every border slows the enemies down.
+
+        Arguments:
+        rect -- the rect to check
+        distance -- the largest distance, measured in pixels, which is still near
+        """
+        for side, edges in ((rect.left, self.right_edges), (rect.right, self.left_edges)):
+            # The edges are on the grid, so only the grid lines near each side need to be checked
+            first_edge = -((distance - side) // self.cell_size) * self.cell_size
+            for edge in range(first_edge, side + distance + 1, self.cell_size):
+                if edge in edges:
+                    return True
+        return False
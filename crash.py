@@ -3,6 +3,7 @@ import sys
 import datetime
 import random
 from menu import Menu
+from fonts import font_registry, render_cache
 
 """This file defines the crash screen."""
 
@@ -21,13 +22,13 @@ class Crash(Menu):
         self.cursor = './assets/menu/cursor.png'
         self.layout = 'h'
         super().__init__(self.background, self.cursor, self.layout, self.display_surface, self.parent)
-        self.font = pygame.font.Font(self.font_file, 32)
+        self.font = font_registry.get(self.font_file, 32)
         self.x = 128
         self.y = 624
         self.step = 440
         self.tags = ['Get Report', 'Save & Quit', 'Quit']
-        self.tb_font = pygame.font.Font(self.font_file, 12)
-        self.report_font = pygame.font.Font(self.font_file, 18)
+        self.tb_font = font_registry.get(self.font_file, 12)
+        self.report_font = font_registry.get(self.font_file, 18)
         self.comments = [
             "It worked in 2021...",
             "What did you do wrong this time?",
@@ -74,7 +75,7 @@ class Crash(Menu):
             report.write("# " + random.choice(self.comments) + "\n\n")
             for string in tb:
                 report.write(string + '\n')
-        confirmation = self.report_font.render(f"Crash report './data/reports/report_{timestamp}.txt' was saved.", False, 'white')
+        confirmation = render_cache.render(self.report_font, f"Crash report './data/reports/report_{timestamp}.txt' was saved.", False, 'white')
         confirmation_rect = confirmation.get_rect(center=self.display_surface.get_rect().center)
         self.display_surface.blit(confirmation, confirmation_rect)
         pygame.display.flip()
@@ -89,7 +90,7 @@ class Crash(Menu):
         """
         y = 160
         for string in tb:
-            text_surface = self.tb_font.render(string, False, 'white')
+            text_surface = render_cache.render(self.tb_font, string, False, 'white')
             self.display_surface.blit(text_surface, (32, y))
             y += 24
 
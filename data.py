@@ -9,19 +9,8 @@ chapter_1a = {
     'enable_mountains': True,
     'horizon': 7,
     'music': './assets/audio/chapter1-2.ogg',
-    'background': './leveldata/empty72.csv',
-    'barriers': './leveldata/chapter1a/chapter1a_barriers.csv',
-    'borders': './leveldata/chapter1a/chapter1a_borders.csv',
-    'buildings': './leveldata/empty72.csv',
-    'decoration': './leveldata/empty72.csv',
-    'enemies': './leveldata/chapter1a/chapter1a_enemies.csv',
-    'energy': './leveldata/chapter1a/chapter1a_energy.csv',
-    'grass': './leveldata/chapter1a/chapter1a_grass.csv',
-    'roofs': './leveldata/empty72.csv',
-    'roots': './leveldata/empty72.csv',
-    'setup': './leveldata/chapter1a/chapter1a_setup.csv',
-    'terrain': './leveldata/chapter1a/chapter1a_terrain.csv',
-    'trees': './leveldata/chapter1a/chapter1a_trees.csv'
+    'map': './leveldata/chapter1a.tmx',
+    'bundle': './leveldata/chapter1a.lvl'
 }
 chapter_1b = {
     'node_pos': (390, 200),
@@ -32,19 +21,8 @@ chapter_1b = {
     'enable_mountains': True,
     'horizon': 6,
     'music': './assets/audio/chapter1-2.ogg',
-    'background': './leveldata/empty144.csv',
-    'barriers': './leveldata/chapter1b/chapter1b_barriers.csv',
-    'borders': './leveldata/chapter1b/chapter1b_borders.csv',
-    'buildings': './leveldata/chapter1b/chapter1b_buildings.csv',
-    'decoration': './leveldata/chapter1b/chapter1b_decoration.csv',
-    'enemies': './leveldata/chapter1b/chapter1b_enemies.csv',
-    'energy': './leveldata/chapter1b/chapter1b_energy.csv',
-    'grass': './leveldata/chapter1b/chapter1b_grass.csv',
-    'roofs': './leveldata/chapter1b/chapter1b_roofs.csv',
-    'roots': './leveldata/chapter1b/chapter1b_roots.csv',
-    'setup': './leveldata/chapter1b/chapter1b_setup.csv',
-    'terrain': './leveldata/chapter1b/chapter1b_terrain.csv',
-    'trees': './leveldata/chapter1b/chapter1b_trees.csv'
+    'map': './leveldata/chapter1b.tmx',
+    'bundle': './leveldata/chapter1b.lvl'
 }
 chapter_2a = {
     'node_pos': (1110, 200),
@@ -55,19 +33,8 @@ chapter_2a = {
     'enable_mountains': True,
     'horizon': 7,
     'music': './assets/audio/chapter1-2.ogg',
-    'background': './leveldata/chapter2a/chapter2a_background.csv',
-    'barriers': './leveldata/chapter2a/chapter2a_barriers.csv',
-    'borders': './leveldata/chapter2a/chapter2a_borders.csv',
-    'buildings': './leveldata/chapter2a/chapter2a_buildings.csv',
-    'decoration': './leveldata/chapter2a/chapter2a_decoration.csv',
-    'enemies': './leveldata/chapter2a/chapter2a_enemies.csv',
-    'energy': './leveldata/chapter2a/chapter2a_energy.csv',
-    'grass': './leveldata/chapter2a/chapter2a_grass.csv',
-    'roofs': './leveldata/chapter2a/chapter2a_roofs.csv',
-    'roots': './leveldata/chapter2a/chapter2a_roots.csv',
-    'setup': './leveldata/chapter2a/chapter2a_setup.csv',
-    'terrain': './leveldata/chapter2a/chapter2a_terrain.csv',
-    'trees': './leveldata/chapter2a/chapter2a_trees.csv'
+    'map': './leveldata/chapter2a.tmx',
+    'bundle': './leveldata/chapter2a.lvl'
 }
 chapter_2b = {
     'node_pos': (1110, 400),
@@ -78,19 +45,8 @@ chapter_2b = {
     'enable_mountains': True,
     'horizon': 8,
     'music': './assets/audio/chapter1-2.ogg',
-    'background': './leveldata/chapter2b/chapter2b_background.csv',
-    'barriers': './leveldata/chapter2b/chapter2b_barriers.csv',
-    'borders': './leveldata/chapter2b/chapter2b_borders.csv',
-    'buildings': './leveldata/chapter2b/chapter2b_buildings.csv',
-    'decoration': './leveldata/chapter2b/chapter2b_decoration.csv',
-    'enemies': './leveldata/chapter2b/chapter2b_enemies.csv',
-    'energy': './leveldata/chapter2b/chapter2b_energy.csv',
-    'grass': './leveldata/chapter2b/chapter2b_grass.csv',
-    'roofs': './leveldata/chapter2b/chapter2b_roofs.csv',
-    'roots': './leveldata/chapter2b/chapter2b_roots.csv',
-    'setup': './leveldata/chapter2b/chapter2b_setup.csv',
-    'terrain': './leveldata/chapter2b/chapter2b_terrain.csv',
-    'trees': './leveldata/chapter2b/chapter2b_trees.csv'
+    'map': './leveldata/chapter2b.tmx',
+    'bundle': './leveldata/chapter2b.lvl'
 }
 chapter_2c = {
     'node_pos': (860, 400),
@@ -101,19 +57,8 @@ chapter_2c = {
     'enable_mountains': True,
     'horizon': 7,
     'music': './assets/audio/chapter1-2.ogg',
-    'background': './leveldata/chapter2c/chapter2c_background.csv',
-    'barriers': './leveldata/chapter2c/chapter2c_barriers.csv',
-    'borders': './leveldata/chapter2c/chapter2c_borders.csv',
-    'buildings': './leveldata/chapter2c/chapter2c_buildings.csv',
-    'decoration': './leveldata/chapter2c/chapter2c_decoration.csv',
-    'enemies': './leveldata/chapter2c/chapter2c_enemies.csv',
-    'energy': './leveldata/chapter2c/chapter2c_energy.csv',
-    'grass': './leveldata/chapter2c/chapter2c_grass.csv',
-    'roofs': './leveldata/chapter2c/chapter2c_roofs.csv',
-    'roots': './leveldata/chapter2c/chapter2c_roots.csv',
-    'setup': './leveldata/chapter2c/chapter2c_setup.csv',
-    'terrain': './leveldata/chapter2c/chapter2c_terrain.csv',
-    'trees': './leveldata/chapter2c/chapter2c_trees.csv'
+    'map': './leveldata/chapter2c.tmx',
+    'bundle': './leveldata/chapter2c.lvl'
 }
 levels = {
     1: {
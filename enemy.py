@@ -1,6 +1,7 @@
 import pygame
 import random
 from tile import AnimatedTile
+from cache import mirror_cache
 
 """This file defines all the enemy behavior."""
 
@@ -24,6 +25,7 @@ class Enemy(AnimatedTile):
         parent -- the 'Level' class
         """
         super().__init__(size, x, y, path)
+        self.mirrored_frames = mirror_cache.get(path, self.frames)
         self.parent = parent
         self.now = pygame.time.get_ticks()
         self.invincible = False
@@ -37,6 +39,7 @@ class Enemy(AnimatedTile):
         self.melee_resistance = melee_resistance
         self.ranged_resistance = ranged_resistance
         self.magical_resistance = magical_resistance
+        self.patrol = (0, 0)  # The limits of the interval between the borders around the enemy, set by the level once the borders are built
         self.toughness = random.choices([i for i in range(3)], [50, 25, 25])[0]
         self.health += self.toughness
         self.damage += int(self.toughness / 2)
@@ -57,20 +60,25 @@ class Enemy(AnimatedTile):
         Arguments:
         delta -- the time delta
         """
-        deadzone_active = False
-        for border in self.parent.border_sprites.sprites():
-            if not deadzone_active:
-                if abs(self.rect.left-border.rect.right) <= 32 or abs(self.rect.right-border.rect.left) <= 32:
-                    deadzone_active = True
-        if deadzone_active:
+        if self.parent.patrol_map.in_deadzone(self.rect, 32):
             self.real_speed = self.speed
         else:
             self.real_speed = int(self.speed*60*delta)
 
+    def check_border_collision(self):
+        """Return whether the enemy ran into a border tile."""
+        left, right = self.patrol
+        if left <= self.rect.left and self.rect.right <= right:
+            return False
+        if self.parent.patrol_map.collide(self.rect):
+            return True
+        self.patrol = self.parent.patrol_map.get_patrol(self.rect)  # The enemy went past a border, so it is patrolling another interval
+        return False
+
     def flip(self):
         """Flip the enemy if it is going left."""
         if self.speed < 0:
-            self.image = pygame.transform.flip(self.image, True, False)
+            self.image = self.mirrored_frames[int(self.frame_index)]
 
     def reverse(self):
         """Invert the enemy speed."""
@@ -83,14 +91,13 @@ class Enemy(AnimatedTile):
             if self.now - self.hurt_time >= 500:
                 self.invincible = False
 
-    def update(self, shift, delta):
+    def update(self, delta):
         """Update the enemy tile.
 
         Arguments:
-        shift -- the camera shift
         delta -- the time delta
         """
-        super().update(shift, delta)
+        super().update(delta)
         self.apply_delta_deadzone(delta)
         self.move()
         self.flip()
@@ -111,14 +118,13 @@ class Skeleton(Enemy):
         super().__init__(size, x, y, path, self.speed, self.health, self.damage, self.energy, self.melee_resistance, self.ranged_resistance, self.magical_resistance, self.parent)
         self.rect.y -= offset
 
-    def update(self, shift, delta):
+    def update(self, delta):
         """Call 'Enemy.update'.
 
         Arguments:
-        shift -- the camera shift
         delta -- the time delta
         """
-        super().update(shift, delta)
+        super().update(delta)
 
 class Zombie(Enemy):
     """This class defines the zombies."""
@@ -135,11 +141,10 @@ class Zombie(Enemy):
         super().__init__(size, x, y, path, self.speed, self.health, self.damage, self.energy, self.melee_resistance, self.ranged_resistance, self.magical_resistance, self.parent)
         self.rect.y -= offset
 
-    def update(self, shift, delta):
+    def update(self, delta):
         """Call 'Enemy.update'.
 
         Arguments:
-        shift -- the camera shift
         delta -- the time delta
         """
-        super().update(shift, delta)
+        super().update(delta)
@@ -0,0 +1,73 @@
+import pygame
+from collections import OrderedDict
+from settings import render_cache_size
+
+"""This file contains the font registry, which opens each font once, and the render cache, which keeps the text surfaces rendered most recently."""
+
+class FontRegistry:
+    """The font registry, which opens each font once in each size and shares it between all the menus and the UI."""
+    def __init__(self):
+        """Setup the registry."""
+        self.fonts = {}
+
+    def get(self, file, size):
+        """Return a font, opening it only if it isn't open yet.
+
+        Arguments:
+        file -- the font file
+        size -- the font size
+        """
+        key = (file, size)
+        if key not in self.fonts:
+            self.fonts[key] = pygame.font.Font(file, size)
+        return self.fonts[key]
+
+class RenderCache:
+    """The render cache, which keeps the text surfaces rendered most recently so that the texts drawn every frame are only rendered once.
+
+    Only the most recently used surfaces are kept, so texts which change every frame can't fill the memory.
+    The surfaces are shared, so they must never be drawn on.
+    """
+    def __init__(self, size):
+        """Setup the cache and its statistics.
+
+        Arguments:
+        size -- the largest number of surfaces to keep
+        """
+        self.size = size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color, background=None):
+        """Return a text rendered with a font, rendering it only if it isn't cached yet.
+
+        Arguments:
+        font -- the font object
+        text -- the text to render
+        antialias -- antialiasing flag
+        color -- the text color
+        background -- the background color (if None, the background is transparent)
+        """
+        key = (font, text, antialias, tuple(pygame.Color(color)), background if background is None else tuple(pygame.Color(background)))
+        if key in self.surfaces:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+        else:
+            self.misses += 1
+            self.surfaces[key] = font.render(text, antialias, color, background)
+            if len(self.surfaces) > self.size:
+                self.surfaces.popitem(last=False)
+        return self.surfaces[key]
+
+    def clear(self):
+        """Remove every surface from the cache."""
+        self.surfaces.clear()
+
+    def get_stats(self):
+        """Return a dictionary with the cache statistics, including the fraction of the renders which were avoided."""
+        requests = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hits / requests if requests else 0, 'surfaces': len(self.surfaces)}
+
+font_registry = FontRegistry()
+render_cache = RenderCache(render_cache_size)
@@ -9,9 +9,11 @@ from math import modf
 from world import World
 from data import levels
 from level import Level
+from loading import LevelAssets, LevelPrefetcher, LoadingScreen
 from menu import MainMenu, Settings, Controls
 from controller import Controller
 from ui import UI
+from inventory import Inventory
 from misc import take_screenshot
 from upgrade import upgrade
 from melee import *
@@ -47,11 +49,14 @@ class Game:
         self.events = pygame.event.get()
         self.controller = Controller()
         self.ui = UI(self.display_surface)
+        self.inventory_screen = Inventory(self.display_surface, self)  # The inventory is built once, then opened again in every level
         self.start_level = 0
         self.end_level = 0
         self.current_subpart = 0
         self.current_part = 1
         self.main_menu = MainMenu(self.display_surface, self)
+        self.prefetcher = LevelPrefetcher()
+        self.world = None  # The world map is built the first time it is shown, then reused
         self.status = 'main_menu'
 
         # Global variables
@@ -177,15 +182,21 @@ class Game:
                 raise Exception(message)
 
     def create_level(self, current_level, current_subpart, current_part):
-        """Build the selected level and update the status.
+        """Start loading the selected level and update the status.
 
         Arguments:
         current_level -- the currently selected level
         current_subpart -- the subpart the level is in
         current_part -- the part the level is in
         """
+        assets = self.prefetcher.take(current_level, current_subpart, current_part)
+        if assets is None:
+            assets = LevelAssets(levels[current_part][current_subpart][current_level])
+            assets.adopt()
+            assets.start()
         self.level = Level(self.display_surface, current_level, current_subpart, current_part, self)
-        self.status = 'level'
+        self.loading_screen = LoadingScreen(self.display_surface, self.level, assets)
+        self.status = 'loading'
 
     def create_world(self, start_level, end_level, current_subpart, current_part):
         """Build the world map and update the status.
@@ -212,7 +223,10 @@ class Game:
         if self.current_subpart >= current_part_lenght:
             self.current_part += 1
             self.current_subpart = 0
-        self.world = World(start_level, self.end_level, self.current_subpart, self.current_part, self.display_surface, self)
+        if self.world is None:
+            self.world = World(start_level, self.end_level, self.current_subpart, self.current_part, self.display_surface, self)
+        else:
+            self.world.setup(start_level, self.end_level, self.current_subpart, self.current_part)
         self.status = 'world'
 
     def create_main_menu(self):
@@ -250,7 +264,10 @@ class Game:
         self.end_level = 0  # self.end_level = self.checkpoint
         self.current_subpart = 0  # self.current_subpart = self.checkpoint_subpart
         self.current_part = 1  # self.current_part = self.checkpoint_part
-        self.world = World(self.start_level, self.end_level, self.current_subpart, self.current_part, self.display_surface, self)
+        if self.world is None:
+            self.world = World(self.start_level, self.end_level, self.current_subpart, self.current_part, self.display_surface, self)
+        else:
+            self.world.setup(self.start_level, self.end_level, self.current_subpart, self.current_part)
         self.status = 'world'
         self.health[self.character] = self.max_health[self.character]
         self.energy[self.character] = 0
@@ -336,6 +353,10 @@ class Game:
             self.controls.run()
         elif self.status == 'world':
             self.world.run()
+        elif self.status == 'loading':
+            self.loading_screen.run()
+            if self.loading_screen.done:
+                self.status = 'level'
         elif self.status == 'level':
             self.level.run(delta)
             if self.level.status == 'level':
@@ -350,6 +371,7 @@ class Game:
                     self.ui.display_melee_overlay(self.selection['melee'].icon_path, self.selection['melee'].durability, self.selection['melee'].max_durability)
                     self.ui.display_ranged_overlay(self.selection['ranged'].icon_path, self.selection['ranged'].projectile.count)
                     self.ui.display_magical_overlay(self.selection['magical'].icon_path, self.selection['magical'].power, self.selection['magical'].max_power)
+                self.ui.draw()
                 self.check_death()
                 if self.level.player.sprite.screenshot_taken:
                     take_screenshot(self.display_surface)
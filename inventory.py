@@ -1,7 +1,9 @@
 import pygame
 from text import render
-from misc import import_folder
-from settings import controllers, tile_size
+from fonts import font_registry, render_cache
+from settings import controllers, tile_size, screen_width, screen_height
+from cache import frame_store, image_cache
+from assetmanager import asset_manager
 from weapons import MeleeWeapon, RangedWeapon, MagicalWeapon
 
 """This file contains the inventory."""
@@ -20,29 +22,22 @@ class Inventory:
         self.game = game
         self.controllers = self.game.controller.controllers
         self.gamepad = self.game.gamepad
-        self.background = pygame.image.load('./assets/menu/menu_bg.png').convert_alpha()
-        self.cursor = import_folder('./assets/menu/inventory/cursor')
-        self.page_cursor = pygame.image.load('./assets/menu/inventory/page_cursor.png').convert_alpha()
-        self.object_section_border = pygame.image.load('./assets/menu/inventory/object_tools_border.png').convert_alpha()
-        self.object_box_border = pygame.image.load('./assets/menu/inventory/object_box_border.png').convert_alpha()
-        self.upgrade_box_border = pygame.image.load('./assets/menu/inventory/upgrade_box_border.png').convert_alpha()
-        self.xp_icon = pygame.image.load('./assets/ui/xp_icon.png').convert_alpha()
-        self.energy_icon = pygame.image.load('./assets/ui/energy_icon.png').convert_alpha()
+        self.background = asset_manager.load_image('./assets/menu/menu_bg.png')
+        self.cursor = frame_store.get('./assets/menu/inventory/cursor')
+        self.still_cursor = image_cache.get('./assets/menu/inventory/cursor/cursor01.png')
+        self.page_cursor = asset_manager.load_image('./assets/menu/inventory/page_cursor.png')
+        self.object_section_border = asset_manager.load_image('./assets/menu/inventory/object_tools_border.png')
+        self.object_box_border = asset_manager.load_image('./assets/menu/inventory/object_box_border.png')
+        self.upgrade_box_border = asset_manager.load_image('./assets/menu/inventory/upgrade_box_border.png')
+        self.xp_icon = asset_manager.load_image('./assets/ui/xp_icon.png')
+        self.energy_icon = asset_manager.load_image('./assets/ui/energy_icon.png')
+        self.icon_atlas = {}  # The scaled object icons, keyed by (icon path, scale)
         self.font_file = './font.ttf'
-        self.page_name_font = pygame.font.Font(self.font_file, 10)
-        self.object_name_font = pygame.font.Font(self.font_file, 18)
-        self.object_description_font = pygame.font.Font(self.font_file, 12)
-        self.object_level_font = pygame.font.Font(self.font_file, 15)
-        self.selection_mode = True
-        self.selected_object = 0
-        self.action_cursor = pygame.image.load('./assets/menu/cursor_settings.png').convert_alpha()
-        self.action_cursor_pos = 0
-        self.actions = []
-        self.action_names = []
-        self.cursor_pos = 0
-        self.cursor_row = 0
-        self.offset = 0
-        self.page = 0
+        self.page_name_font = font_registry.get(self.font_file, 10)
+        self.object_name_font = font_registry.get(self.font_file, 18)
+        self.object_description_font = font_registry.get(self.font_file, 12)
+        self.object_level_font = font_registry.get(self.font_file, 15)
+        self.action_cursor = asset_manager.load_image('./assets/menu/cursor_settings.png')
         self.pages = ["Weapons", "Selection"]
         self.names = ['weapons']
         self.page_icons = [
@@ -64,7 +59,6 @@ class Inventory:
             #'item': (580, 275)
             #'ability': (580, 400)
         }
-        self.selection_cursor_pos = 'melee'
         self.selection_names = {
             'melee': "Melee weapon",
             'ranged': "Ranged weapon",
@@ -80,12 +74,31 @@ class Inventory:
             #'ability': "Ability"
         }
         self.cursor_animation_speed = 10  # Animation frames per second
+        self.page_surface = pygame.Surface((screen_width, screen_height)).convert()
+        self.dirty_frames = 0
+        self.clean_frames = 0
+
+        # SFX
+        self.sfx = asset_manager.load_sound('./assets/audio/sfx/menu_select.ogg')
+
+        self.open()
+
+    def open(self):
+        """Reset the cursors and the input state, so that the inventory opens as if it was just built."""
+        self.selection_mode = True
+        self.selected_object = 0
+        self.action_cursor_pos = 0
+        self.actions = []
+        self.action_names = []
+        self.cursor_pos = 0
+        self.cursor_row = 0
+        self.offset = 0
+        self.page = 0
+        self.selection_cursor_pos = 'melee'
         self.cursor_animation_frame_index = 0
         self.now = 0  # This is a dummy value
         self.gen_time = pygame.time.get_ticks()
-
-        # SFX
-        self.sfx = pygame.mixer.Sound('./assets/audio/sfx/menu_select.ogg')
+        self.page_state = None  # The state the page surface was drawn with (the objects may have changed while the inventory was closed)
 
         # Input initialization
         self.keydown_left = False
@@ -108,239 +121,243 @@ class Inventory:
     def _load_page_icons(self):
         """Create surfaces by overwriting file names in 'self.page_icons'."""
         for index, filename in enumerate(self.page_icons):
-            self.page_icons[index] = pygame.image.load(filename).convert_alpha()
+            self.page_icons[index] = asset_manager.load_image(filename)
+
+    def get_icon(self, icon_path, scale):
+        """Return an object icon scaled by a factor, scaling it only the first time it is needed.
+
+        Arguments:
+        icon_path -- the path to the object icon
+        scale -- the factor to scale the icon by
+        """
+        key = (icon_path, scale)
+        if key not in self.icon_atlas:
+            self.icon_atlas[key] = pygame.transform.scale_by(image_cache.get(icon_path), scale)
+        return self.icon_atlas[key]
 
     def display_objects(self):
         """Display the inventory objects."""
         object_col = 0
         object_row = 0
         for obj in self.game.inventory[self.names[self.page]][5*self.offset:5*self.offset+15]:
-            obj_surf = pygame.image.load(obj.icon_path).convert_alpha()
-            obj_surf = pygame.transform.scale_by(obj_surf, 1.5)
+            obj_surf = self.get_icon(obj.icon_path, 1.5)
             obj_x = 80 + 125*object_col
             obj_y = 150 + 125*object_row
             obj_rect = obj_surf.get_rect(center=(obj_x, obj_y))
-            self.display_surface.blit(obj_surf, obj_rect)
+            self.page_surface.blit(obj_surf, obj_rect)
             object_col += 1
             if object_col >= 5:
                 object_col = 0
                 object_row += 1
 
+    def get_cursor_center(self):
+        """Return the center of the cursor on the current page."""
+        if self.page == 0:
+            return (80 + 125*self.cursor_pos, 150 + 125*self.cursor_row)
+        return self.selection_hotspots[self.selection_cursor_pos]
+
     def display_cursor(self):
-        """Draw and animate the cursor."""
-        if self.selection_mode:
-            self.cursor_animation_frame_index += self.cursor_animation_speed*self.game.level.delta
-            if self.cursor_animation_frame_index >= len(self.cursor):
-                self.cursor_animation_frame_index = 0
-            cursor_surf = self.cursor[int(self.cursor_animation_frame_index)]
-        else:
-            cursor_surf = pygame.image.load('./assets/menu/inventory/cursor/cursor01.png').convert_alpha()
-        cursor_x = 80 + 125*self.cursor_pos
-        cursor_y = 150 + 125*self.cursor_row
-        cursor_rect = cursor_surf.get_rect(center=(cursor_x, cursor_y))
+        """Draw the still cursor shown while an object is selected."""
+        if not self.selection_mode:
+            cursor_rect = self.still_cursor.get_rect(center=self.get_cursor_center())
+            self.page_surface.blit(self.still_cursor, cursor_rect)
+
+    def animate_cursor(self):
+        """Animate the cursor and draw it to screen over the page (must be called every frame in selection mode)."""
+        self.cursor_animation_frame_index += self.cursor_animation_speed*self.game.level.delta
+        if self.cursor_animation_frame_index >= len(self.cursor):
+            self.cursor_animation_frame_index = 0
+        cursor_surf = self.cursor[int(self.cursor_animation_frame_index)]
+        cursor_rect = cursor_surf.get_rect(center=self.get_cursor_center())
         self.display_surface.blit(cursor_surf, cursor_rect)
 
     def display_selection_objects(self):
         """Display objects in selection."""
         for obj, hotspot in self.selection_hotspots.items():
-            obj_surf = pygame.image.load(self.game.selection[obj].icon_path).convert_alpha()
-            obj_surf = pygame.transform.scale_by(obj_surf, 1.5)
+            obj_surf = self.get_icon(self.game.selection[obj].icon_path, 1.5)
             obj_rect = obj_surf.get_rect(center=hotspot)
-            self.display_surface.blit(obj_surf, obj_rect)
+            self.page_surface.blit(obj_surf, obj_rect)
 
     def display_selection_name(self):
         """Display the name of the currently selected object below the icon."""
-        selection_title = self.object_level_font.render("Currently hovering over:", False, 'white')
+        selection_title = render_cache.render(self.object_level_font, "Currently hovering over:", False, 'white')
         selection_title_rect = selection_title.get_rect(topleft=(705, 222))
-        self.display_surface.blit(selection_title, selection_title_rect)
-        selection_name = self.object_description_font.render(self.selection_names[self.selection_cursor_pos], False, 'white')
+        self.page_surface.blit(selection_title, selection_title_rect)
+        selection_name = render_cache.render(self.object_description_font, self.selection_names[self.selection_cursor_pos], False, 'white')
         selection_name_rect = selection_name.get_rect(topleft=(705, selection_title_rect.bottom+10))
-        self.display_surface.blit(selection_name, selection_name_rect)
-
-    def display_selection_cursor(self):
-        """Draw and animate the cursor in selection."""
-        if self.selection_mode:
-            self.cursor_animation_frame_index += self.cursor_animation_speed*self.game.level.delta
-            if self.cursor_animation_frame_index >= len(self.cursor):
-                self.cursor_animation_frame_index = 0
-            cursor_surf = self.cursor[int(self.cursor_animation_frame_index)]
-        else:
-            cursor_surf = pygame.image.load('./assets/menu/inventory/cursor/cursor01.png').convert_alpha()
-        cursor_rect = cursor_surf.get_rect(center=self.selection_hotspots[self.selection_cursor_pos])
-        self.display_surface.blit(cursor_surf, cursor_rect)
+        self.page_surface.blit(selection_name, selection_name_rect)
 
     def display_page_cursor(self):
         """Draw the page cursor."""
         cursor_x = 80 + 125*self.page
         cursor_rect = self.page_cursor.get_rect(center=(cursor_x, 40))
-        self.display_surface.blit(self.page_cursor, cursor_rect)
+        self.page_surface.blit(self.page_cursor, cursor_rect)
 
     def display_page_icons(self):
         """Draw the page icons."""
         for index, icon in enumerate(self.page_icons):
             icon_x = 80 + 125*index
             icon_rect = icon.get_rect(midtop=(icon_x, 15))
-            self.display_surface.blit(icon, icon_rect)
+            self.page_surface.blit(icon, icon_rect)
 
     def display_page_name(self):
         """Display the current page name below the icon."""
-        page_name = self.page_name_font.render(self.pages[self.page], False, 'white')
+        page_name = render_cache.render(self.page_name_font, self.pages[self.page], False, 'white')
         page_name_x = 80 + 125*self.page
         page_name_rect = page_name.get_rect(midbottom=(page_name_x, 65))
-        self.display_surface.blit(page_name, page_name_rect)
+        self.page_surface.blit(page_name, page_name_rect)
 
     def display_object_section(self):
         """Display everything in the object section."""
         level_table = {1: "I", 2: "II", 3: "III", 4: "IV", 5: "V"}
         level_color_table = {1: '#c0c0c0', 2: '#00ff66', 3: '#17599c', 4: '#5c35ae', 5: '#a62d19'}
         object_section_border_rect = self.object_section_border.get_rect(midright=(1265, 352))
-        self.display_surface.blit(self.object_section_border, object_section_border_rect)
+        self.page_surface.blit(self.object_section_border, object_section_border_rect)
         object_box_border_rect = self.object_box_border.get_rect(topleft=object_section_border_rect.topleft+pygame.Vector2(20, 20))
-        self.display_surface.blit(self.object_box_border, object_box_border_rect)
+        self.page_surface.blit(self.object_box_border, object_box_border_rect)
         if not self.selection_mode:
             if self.page == 0:
                 obj = self.game.inventory[self.names[self.page]][self.selected_object]
             elif self.page == 1:
                 obj = self.game.selection[self.selection_cursor_pos]
             # Icon
-            object_icon = pygame.image.load(obj.icon_path).convert_alpha()
-            object_icon = pygame.transform.scale_by(object_icon, 2)
+            object_icon = self.get_icon(obj.icon_path, 2)
             object_icon_rect = object_icon.get_rect(center=object_box_border_rect.center)
-            self.display_surface.blit(object_icon, object_icon_rect)
+            self.page_surface.blit(object_icon, object_icon_rect)
             # Name
-            object_name = self.object_name_font.render(obj.name, False, 'white')
+            object_name = render_cache.render(self.object_name_font, obj.name, False, 'white')
             object_name_rect = object_name.get_rect(topleft=object_box_border_rect.topright+pygame.Vector2(25, 0))
-            self.display_surface.blit(object_name, object_name_rect)
+            self.page_surface.blit(object_name, object_name_rect)
             # Description
             object_description_rect = pygame.Rect(object_box_border_rect.topright+pygame.Vector2(25, 40), (360, 120))
-            render(obj.description, self.object_description_font, self.display_surface, object_description_rect, 'white', -2)
+            render(obj.description, self.object_description_font, self.page_surface, object_description_rect, 'white', -2)
             if isinstance(obj, MeleeWeapon):  # Melee weapons
                 # Level
-                level = self.object_level_font.render(f"Level {level_table[obj.level]}", False, level_color_table[obj.level])
+                level = render_cache.render(self.object_level_font, f"Level {level_table[obj.level]}", False, level_color_table[obj.level])
                 level_rect = level.get_rect(topleft=object_box_border_rect.bottomleft+pygame.Vector2(0, 20))
-                self.display_surface.blit(level, level_rect)
+                self.page_surface.blit(level, level_rect)
                 # Damage
-                damage = self.object_description_font.render(f"Damage: {obj.damage[obj.level]} HP", False, 'white')
+                damage = render_cache.render(self.object_description_font, f"Damage: {obj.damage[obj.level]} HP", False, 'white')
                 damage_rect = damage.get_rect(topleft=level_rect.bottomleft+pygame.Vector2(0, 10))
-                self.display_surface.blit(damage, damage_rect)
+                self.page_surface.blit(damage, damage_rect)
                 # Cooldown
-                cooldown = self.object_description_font.render(f"Cooldown: {format(obj.cooldown/1000, '.2f')} s", False, 'white')
+                cooldown = render_cache.render(self.object_description_font, f"Cooldown: {format(obj.cooldown/1000, '.2f')} s", False, 'white')
                 cooldown_rect = cooldown.get_rect(topleft=damage_rect.bottomleft+pygame.Vector2(0, 5))
-                self.display_surface.blit(cooldown, cooldown_rect)
+                self.page_surface.blit(cooldown, cooldown_rect)
                 # Durability
                 if obj.durability/obj.max_durability < 0.1: durability_color = '#bb0000'
                 elif 0.1 <= obj.durability/obj.max_durability < 0.25: durability_color = 'gold'
                 else: durability_color = 'white'
-                durability = self.object_description_font.render(f"Durability: {obj.durability} / {obj.max_durability}", False, durability_color)
+                durability = render_cache.render(self.object_description_font, f"Durability: {obj.durability} / {obj.max_durability}", False, durability_color)
                 durability_rect = durability.get_rect(topleft=cooldown_rect.bottomleft+pygame.Vector2(0, 5))
-                self.display_surface.blit(durability, durability_rect)
+                self.page_surface.blit(durability, durability_rect)
                 # Range
-                obj_range = self.object_description_font.render(f"Range: {format(obj.range/tile_size, '.1f')} bl", False, 'white')
+                obj_range = render_cache.render(self.object_description_font, f"Range: {format(obj.range/tile_size, '.1f')} bl", False, 'white')
                 obj_range_rect = obj_range.get_rect(topleft=durability_rect.bottomleft+pygame.Vector2(0, 5))
-                self.display_surface.blit(obj_range, obj_range_rect)
+                self.page_surface.blit(obj_range, obj_range_rect)
             elif isinstance(obj, RangedWeapon):  # Ranged weapons
                 # Level
-                level = self.object_level_font.render(f"Level {level_table[obj.level]}", False, level_color_table[obj.level])
+                level = render_cache.render(self.object_level_font, f"Level {level_table[obj.level]}", False, level_color_table[obj.level])
                 level_rect = level.get_rect(topleft=object_box_border_rect.bottomleft+pygame.Vector2(0, 20))
-                self.display_surface.blit(level, level_rect)
+                self.page_surface.blit(level, level_rect)
                 # Damage
-                damage = self.object_description_font.render(f"Damage: {obj.damage[obj.level]} HP", False, 'white')
+                damage = render_cache.render(self.object_description_font, f"Damage: {obj.damage[obj.level]} HP", False, 'white')
                 damage_rect = damage.get_rect(topleft=level_rect.bottomleft+pygame.Vector2(0, 10))
-                self.display_surface.blit(damage, damage_rect)
+                self.page_surface.blit(damage, damage_rect)
                 # Cooldown
-                cooldown = self.object_description_font.render(f"Cooldown: {format(obj.cooldown/1000, '.2f')} s", False, 'white')
+                cooldown = render_cache.render(self.object_description_font, f"Cooldown: {format(obj.cooldown/1000, '.2f')} s", False, 'white')
                 cooldown_rect = cooldown.get_rect(topleft=damage_rect.bottomleft+pygame.Vector2(0, 5))
-                self.display_surface.blit(cooldown, cooldown_rect)
+                self.page_surface.blit(cooldown, cooldown_rect)
                 # Range
-                obj_range = self.object_description_font.render(f"Range: {format(obj.range/tile_size, '.1f')} bl", False, 'white')
+                obj_range = render_cache.render(self.object_description_font, f"Range: {format(obj.range/tile_size, '.1f')} bl", False, 'white')
                 obj_range_rect = obj_range.get_rect(topleft=cooldown_rect.bottomleft+pygame.Vector2(0, 5))
-                self.display_surface.blit(obj_range, obj_range_rect)
+                self.page_surface.blit(obj_range, obj_range_rect)
                 # Speed
-                speed = self.object_description_font.render(f"Speed: {format(obj.speed*60/tile_size, '.2f')} bl/s", False, 'white')
+                speed = render_cache.render(self.object_description_font, f"Speed: {format(obj.speed*60/tile_size, '.2f')} bl/s", False, 'white')
                 speed_rect = speed.get_rect(topleft=obj_range_rect.bottomleft+pygame.Vector2(0, 5))
-                self.display_surface.blit(speed, speed_rect)
+                self.page_surface.blit(speed, speed_rect)
                 # Projectile info
-                projectile = self.object_description_font.render(f"Projectile: {obj.projectile.name} ({obj.projectile.count} remaining)", False, 'white')
+                projectile = render_cache.render(self.object_description_font, f"Projectile: {obj.projectile.name} ({obj.projectile.count} remaining)", False, 'white')
                 projectile_rect = projectile.get_rect(topleft=speed_rect.bottomleft+pygame.Vector2(0, 5))
-                self.display_surface.blit(projectile, projectile_rect)
+                self.page_surface.blit(projectile, projectile_rect)
             elif isinstance(obj, MagicalWeapon):  # Magical weapons
                 # Level
-                level = self.object_level_font.render(f"Level {level_table[obj.level]}", False, level_color_table[obj.level])
+                level = render_cache.render(self.object_level_font, f"Level {level_table[obj.level]}", False, level_color_table[obj.level])
                 level_rect = level.get_rect(topleft=object_box_border_rect.bottomleft+pygame.Vector2(0, 20))
-                self.display_surface.blit(level, level_rect)
+                self.page_surface.blit(level, level_rect)
                 # Damage
-                damage = self.object_description_font.render(f"Damage: {obj.damage[obj.level]} HP", False, 'white')
+                damage = render_cache.render(self.object_description_font, f"Damage: {obj.damage[obj.level]} HP", False, 'white')
                 damage_rect = damage.get_rect(topleft=level_rect.bottomleft+pygame.Vector2(0, 10))
-                self.display_surface.blit(damage, damage_rect)
+                self.page_surface.blit(damage, damage_rect)
                 # Cooldown
-                cooldown = self.object_description_font.render(f"Cooldown: {format(obj.cooldown/1000, '.2f')} s", False, 'white')
+                cooldown = render_cache.render(self.object_description_font, f"Cooldown: {format(obj.cooldown/1000, '.2f')} s", False, 'white')
                 cooldown_rect = cooldown.get_rect(topleft=damage_rect.bottomleft+pygame.Vector2(0, 5))
-                self.display_surface.blit(cooldown, cooldown_rect)
+                self.page_surface.blit(cooldown, cooldown_rect)
                 # Power
                 if obj.power/obj.max_power < 0.1: power_color = '#bb0000'
                 elif 0.1 <= obj.power/obj.max_power < 0.25: power_color = 'gold'
                 else: power_color = 'white'
-                power = self.object_description_font.render(f"Power: {obj.power} / {obj.max_power}", False, power_color)
+                power = render_cache.render(self.object_description_font, f"Power: {obj.power} / {obj.max_power}", False, power_color)
                 power_rect = power.get_rect(topleft=cooldown_rect.bottomleft+pygame.Vector2(0, 5))
-                self.display_surface.blit(power, power_rect)
+                self.page_surface.blit(power, power_rect)
                 # Range
-                obj_range = self.object_description_font.render(f"Range: {format(obj.range/tile_size, '.1f')} bl", False, 'white')
+                obj_range = render_cache.render(self.object_description_font, f"Range: {format(obj.range/tile_size, '.1f')} bl", False, 'white')
                 obj_range_rect = obj_range.get_rect(topleft=power_rect.bottomleft+pygame.Vector2(0, 5))
-                self.display_surface.blit(obj_range, obj_range_rect)
+                self.page_surface.blit(obj_range, obj_range_rect)
                 # Speed
-                speed = self.object_description_font.render(f"Speed: {format(obj.speed*60/tile_size, '.2f')} bl/s", False, 'white')
+                speed = render_cache.render(self.object_description_font, f"Speed: {format(obj.speed*60/tile_size, '.2f')} bl/s", False, 'white')
                 speed_rect = speed.get_rect(topleft=obj_range_rect.bottomleft+pygame.Vector2(0, 5))
-                self.display_surface.blit(speed, speed_rect)
+                self.page_surface.blit(speed, speed_rect)
                 # Cost
-                cost = self.object_description_font.render(f"Cost: {obj.cost} EP", False, 'gold')
+                cost = render_cache.render(self.object_description_font, f"Cost: {obj.cost} EP", False, 'gold')
                 cost_rect = cost.get_rect(topleft=speed_rect.bottomleft+pygame.Vector2(0, 5))
-                self.display_surface.blit(cost, cost_rect)
+                self.page_surface.blit(cost, cost_rect)
                 # Attack info
-                attack_text = self.object_description_font.render("Attack info:", False, 'white')
+                attack_text = render_cache.render(self.object_description_font, "Attack info:", False, 'white')
                 attack_rect = attack_text.get_rect(topleft=level_rect.topright+pygame.Vector2(150, 0))
-                self.display_surface.blit(attack_text, attack_rect)
+                self.page_surface.blit(attack_text, attack_rect)
                 attack_info_rect = pygame.Rect(level_rect.topright+pygame.Vector2(150, 30), (290, 300))
-                render(obj.attack_desc, self.object_description_font, self.display_surface, attack_info_rect, 'white', -2)
+                render(obj.attack_desc, self.object_description_font, self.page_surface, attack_info_rect, 'white', -2)
         else:
-            inventory_text = self.object_name_font.render("Inventory", False, 'white')
+            inventory_text = render_cache.render(self.object_name_font, "Inventory", False, 'white')
             inventory_text_rect = inventory_text.get_rect(topleft=object_box_border_rect.topright+pygame.Vector2(25, 0))
-            self.display_surface.blit(inventory_text, inventory_text_rect)
+            self.page_surface.blit(inventory_text, inventory_text_rect)
             instruction_text_rect = pygame.Rect(object_box_border_rect.topright+pygame.Vector2(25, 40), (360, 120))
-            render("Select an object to view its data and possible actions.", self.object_description_font, self.display_surface, instruction_text_rect, 'white', -2)
+            render("Select an object to view its data and possible actions.", self.object_description_font, self.page_surface, instruction_text_rect, 'white', -2)
 
     def display_upgrade_box(self):
         """Display everything in the upgrade box."""
         upgrade_box_border_rect = self.upgrade_box_border.get_rect(bottomleft=(30, 692))
-        self.display_surface.blit(self.upgrade_box_border, upgrade_box_border_rect)
+        self.page_surface.blit(self.upgrade_box_border, upgrade_box_border_rect)
         xp_icon_rect = self.xp_icon.get_rect(topleft=upgrade_box_border_rect.topleft+pygame.Vector2(20, 20))
-        self.display_surface.blit(self.xp_icon, xp_icon_rect)
-        current_xp = self.object_description_font.render(str(self.game.experience[self.game.character]), False, 'white')
+        self.page_surface.blit(self.xp_icon, xp_icon_rect)
+        current_xp = render_cache.render(self.object_description_font, str(self.game.experience[self.game.character]), False, 'white')
         current_xp_rect = current_xp.get_rect(midleft=xp_icon_rect.midright+pygame.Vector2(10, 0))
-        self.display_surface.blit(current_xp, current_xp_rect)
+        self.page_surface.blit(current_xp, current_xp_rect)
         energy_icon_rect = self.energy_icon.get_rect(midleft=xp_icon_rect.midright+pygame.Vector2(80, 0))
-        self.display_surface.blit(self.energy_icon, energy_icon_rect)
-        current_ep = self.object_description_font.render(str(self.game.energy[self.game.character]), False, 'white')
+        self.page_surface.blit(self.energy_icon, energy_icon_rect)
+        current_ep = render_cache.render(self.object_description_font, str(self.game.energy[self.game.character]), False, 'white')
         current_ep_rect = current_ep.get_rect(midleft=energy_icon_rect.midright+pygame.Vector2(10, 0))
-        self.display_surface.blit(current_ep, current_ep_rect)
+        self.page_surface.blit(current_ep, current_ep_rect)
         if not self.selection_mode:
             if self.page == 0:
                 obj = self.game.inventory[self.names[self.page]][self.selected_object]
             elif self.page == 1:
                 obj = self.game.selection[self.selection_cursor_pos]
             if isinstance(obj, MeleeWeapon):
-                repair_cost = self.object_description_font.render(f"Repair cost: {obj.repair_cost}", False, 'white')
+                repair_cost = render_cache.render(self.object_description_font, f"Repair cost: {obj.repair_cost}", False, 'white')
                 repair_cost_rect = repair_cost.get_rect(midleft=energy_icon_rect.midright+pygame.Vector2(180, 0))
-                self.display_surface.blit(repair_cost, repair_cost_rect)
-                self.display_surface.blit(self.xp_icon, self.xp_icon.get_rect(midleft=repair_cost_rect.midright+pygame.Vector2(5, 0)))
+                self.page_surface.blit(repair_cost, repair_cost_rect)
+                self.page_surface.blit(self.xp_icon, self.xp_icon.get_rect(midleft=repair_cost_rect.midright+pygame.Vector2(5, 0)))
             elif isinstance(obj, MagicalWeapon):
-                refill_cost = self.object_description_font.render(f"Refill cost: {obj.refill_cost}", False, 'white')
+                refill_cost = render_cache.render(self.object_description_font, f"Refill cost: {obj.refill_cost}", False, 'white')
                 refill_cost_rect = refill_cost.get_rect(midleft=energy_icon_rect.midright+pygame.Vector2(180, 0))
-                self.display_surface.blit(refill_cost, refill_cost_rect)
-                self.display_surface.blit(self.xp_icon, self.xp_icon.get_rect(midleft=refill_cost_rect.midright+pygame.Vector2(5, 0)))
+                self.page_surface.blit(refill_cost, refill_cost_rect)
+                self.page_surface.blit(self.xp_icon, self.xp_icon.get_rect(midleft=refill_cost_rect.midright+pygame.Vector2(5, 0)))
         # Coming soon text
-        coming_soon_text = self.object_name_font.render("Upgrade system coming soon!!", False, 'white')
+        coming_soon_text = render_cache.render(self.object_name_font, "Upgrade system coming soon!!", False, 'white')
         coming_soon_text_rect = coming_soon_text.get_rect(center=upgrade_box_border_rect.center)
-        self.display_surface.blit(coming_soon_text, coming_soon_text_rect)
+        self.page_surface.blit(coming_soon_text, coming_soon_text_rect)
 
     def get_actions(self):
         """Get the right actions for the currently selected object."""
@@ -384,16 +401,16 @@ class Inventory:
         """Display the text for the object actions."""
         y = 480
         for text in self.action_names:
-            text_surf = self.object_name_font.render(text, False, 'white')
+            text_surf = render_cache.render(self.object_name_font, text, False, 'white')
             text_rect = text_surf.get_rect(topleft=(750, y))
-            self.display_surface.blit(text_surf, text_rect)
+            self.page_surface.blit(text_surf, text_rect)
             y += 32
 
     def display_action_cursor(self):
         """Display the action cursor."""
         action_cursor_y = 465 + 32*self.action_cursor_pos
         action_cursor_rect = self.action_cursor.get_rect(topright=(750, action_cursor_y))
-        self.display_surface.blit(self.action_cursor, action_cursor_rect)
+        self.page_surface.blit(self.action_cursor, action_cursor_rect)
 
     def return_to_selection(self):
         """Return to selection mode."""
@@ -407,6 +424,7 @@ class Inventory:
         sel = self.game.selection
         if isinstance(obj, MeleeWeapon):
             inv_list[self.selected_object], sel['melee'] = sel['melee'], obj
+            self.game.level.player.sprite.import_attack_animation()
         elif isinstance(obj, RangedWeapon):
             inv_list[self.selected_object], sel['ranged'] = sel['ranged'], obj
         elif isinstance(obj, MagicalWeapon):
@@ -625,6 +643,7 @@ class Inventory:
                     self.buttondown_a = True
                     self.actions[self.action_cursor_pos]()
                     self.action_cursor_pos = 0
+                    self.page_state = None  # The action may have changed the objects
                 if (keys[pygame.K_ESCAPE] or controller_b) and not (self.keydown_esc or self.buttondown_b):
                     self.sfx.play()
                     self.keydown_esc = True
@@ -702,6 +721,7 @@ class Inventory:
                     self.buttondown_a = True
                     self.actions[self.action_cursor_pos]()
                     self.action_cursor_pos = 0
+                    self.page_state = None  # The action may have changed the objects
                 if (keys[pygame.K_ESCAPE] or controller_b) and not (self.keydown_esc or self.buttondown_b):
                     self.sfx.play()
                     self.keydown_esc = True
@@ -725,31 +745,59 @@ class Inventory:
         if not controller_a: self.buttondown_a = False
         if not controller_b: self.buttondown_b
 
-    def run(self):
-        self.now = pygame.time.get_ticks()
-        self.display_surface.blit(self.background, (0, 0))
+    def get_page_state(self):
+        """Return the cursors and the page the page surface depends on."""
+        return (self.page, self.selection_mode, self.cursor_pos, self.cursor_row, self.offset, self.selected_object, self.selection_cursor_pos, self.action_cursor_pos)
+
+    def draw_page(self):
+        """Draw the current page into the page surface."""
+        self.page_surface.blit(self.background, (0, 0))
         self.display_page_icons()
         self.display_page_cursor()
         self.display_page_name()
-        if self.now - self.gen_time >= 250:
-            self.get_input()
         if self.page == 0:
             self.display_objects()
             self.display_cursor()
             self.display_object_section()
             self.display_upgrade_box()
             if not self.selection_mode:
-                self.get_actions()
                 self.display_action_text()
                 self.display_action_cursor()
         elif self.page == 1:
             self.display_selection_objects()
-            self.display_selection_cursor()
+            self.display_cursor()
             self.display_object_section()
             self.display_upgrade_box()
             if not self.selection_mode:
-                self.get_selection_actions()
                 self.display_action_text()
                 self.display_action_cursor()
             else:
                 self.display_selection_name()
+
+    def get_stats(self):
+        """Return a dictionary with the number of frames in which the page surface was drawn again (dirty) or reused (clean)."""
+        return {'dirty': self.dirty_frames, 'clean': self.clean_frames}
+
+    def run(self):
+        """Run the inventory screen (must be called every frame).
+
+        The page is only drawn again when the page, a cursor or the objects change, so the other frames only blit the page surface (and the animated cursor in selection mode).
+        """
+        self.now = pygame.time.get_ticks()
+        if self.now - self.gen_time >= 250:
+            self.get_input()
+        if not self.selection_mode:
+            if self.page == 0:
+                self.get_actions()
+            elif self.page == 1:
+                self.get_selection_actions()
+        page_state = self.get_page_state()
+        if page_state != self.page_state:
+            self.draw_page()
+            self.page_state = page_state
+            self.dirty_frames += 1
+        else:
+            self.clean_frames += 1
+        self.display_surface.blit(self.page_surface, (0, 0))
+        if self.selection_mode:
+            self.animate_cursor()
@@ -1,23 +1,116 @@
 import pygame
 import random
+from bisect import bisect_left
 from misc import *
 from settings import *
 from tile import *
 from enemy import *
 from bgstuff import *
 from player import Player
-from particles import Particle
-from weapons import Projectile
+from particles import ParticlePool
+from weapons import ProjectilePool
+from cache import atlas_cache, tile_atlases
+from assetmanager import asset_manager
+from collision import CollisionGrid, PatrolMap
 from menu import PauseMenu
-from inventory import Inventory
 from data import levels
 
 """This file contains the level builder and numerous functions to control the game behavior."""
 
+class Camera:
+    """The camera, which keeps the world offset so that every sprite can keep its world position."""
+    def __init__(self):
+        """Setup the world offset, the background offset and the culling statistics."""
+        self.x = 0  # The world X position of the left side of the screen
+        self.background_x = 0  # The same position for the background, which scrolls at a third of the speed
+        self.indexes = {}  # The sprites of every static group sorted by their left side, keyed by group
+        self.drawn = 0
+        self.culled = 0
+
+    def scroll(self, shift):
+        """Scroll the camera.
+
+        Arguments:
+        shift -- the amount the world moves on screen (positive when the world moves right)
+        """
+        self.x -= shift
+        self.background_x -= int(shift / 3)
+
+    def apply(self, rect, background=False):
+        """Return a rect moved from world position to screen position.
+
+        Arguments:
+        rect -- the rect to move
+        background -- if this flag is set to True, the background offset is used
+        """
+        return rect.move(-(self.background_x if background else self.x), 0)
+
+    def get_viewport(self, background=False, margin=0):
+        """Return the part of the world shown on screen.
+
+        Arguments:
+        background -- if this flag is set to True, the background offset is used
+        margin -- how far the viewport extends outside the screen on every side
+        """
+        return pygame.Rect((self.background_x if background else self.x) - margin, -margin, screen_width + 2 * margin, screen_height + 2 * margin)
+
+    def add_static(self, group):
+        """Index a group whose sprites never move, so that culling it only looks at the sprites near the screen (sprites can still be removed from the group afterwards).
+
+        Arguments:
+        group -- the group to index
+        """
+        sprites = sorted(enumerate(group.sprites()), key=lambda item: item[1].rect.left)
+        lefts = [sprite.rect.left for _, sprite in sprites]
+        max_width = max((sprite.rect.width for _, sprite in sprites), default=0)
+        self.indexes[group] = (lefts, sprites, max_width)
+
+    def get_visible(self, group, background=False):
+        """Return a list with the sprites of a group which overlap the screen plus the culling margin, in drawing order.
+
+        Arguments:
+        group -- the group to cull
+        background -- if this flag is set to True, the background offset is used
+        """
+        viewport = self.get_viewport(background, cull_margin)
+        if group in self.indexes:
+            # Only the sprites whose left side is close enough to the viewport can overlap it
+            lefts, sprites, max_width = self.indexes[group]
+            start = bisect_left(lefts, viewport.left - max_width)
+            stop = bisect_left(lefts, viewport.right)
+            return [sprite for _, sprite in sorted(item for item in sprites[start:stop] if item[1].rect.colliderect(viewport) and item[1] in group)]
+        sprites = group.sprites()
+        return [sprites[index] for index in viewport.collidelistall([sprite.rect for sprite in sprites])]
+
+    def draw(self, group, display_surface, background=False, visible=None):
+        """Draw the sprites of a group which are on screen at their screen position.
+
+        Arguments:
+        group -- the group to draw
+        display_surface -- the screen
+        background -- if this flag is set to True, the background offset is used
+        visible -- the sprites of the group returned by 'get_visible' in the current frame (if None, the group is culled again)
+        """
+        offset = self.background_x if background else self.x
+        if visible is None:
+            visible = self.get_visible(group, background)
+        self.drawn += len(visible)
+        self.culled += len(group) - len(visible)
+        display_surface.blits([(sprite.image, sprite.rect.move(-offset, 0)) for sprite in visible], False)
+
+    def reset_stats(self):
+        """Reset the culling statistics (must be called at the start of every frame)."""
+        self.drawn = 0
+        self.culled = 0
+
+    def get_stats(self):
+        """Return a dictionary with the number of sprites drawn and culled in the current frame."""
+        return {'drawn': self.drawn, 'culled': self.culled}
+
 class Level:
     """The level builder class."""
     def __init__(self, display_surface, current_level, current_subpart, current_part, parent):
-        """Setup the builder, the level layout, the player and the background.
+        """Setup the builder (the level itself is built by the 'build' method while the loading screen is shown).
 
         Arguments:
         current_level -- the currently selected level
@@ -36,17 +129,11 @@ class Level:
         self.volume = self.parent.volume
         self.fade = self.parent.fade
         self.shift = 0
-        self.start_x = 0
+        self.camera = Camera()
         self.pause_start = 0
         self.time_paused = 0
         self.delta = 0
 
-        # Loading screen
-        self.display_surface.fill('black')
-        loading_screen = pygame.image.load('./assets/ui/loading.png').convert_alpha()
-        self.display_surface.blit(loading_screen, (64, 64))
-        pygame.display.flip()
-
         # World setup
         self.create_world = self.parent.create_world
         self.end_level = self.parent.end_level
@@ -63,45 +150,72 @@ class Level:
         self.update_energy = self.parent.update_energy
         self.reset_energy_overflow = self.parent.reset_energy_overflow
         self.display_overlay = True
+        self.build_steps = 17  # The number of steps yielded by 'build'
+
+    def build(self, assets):
+        """Build the level layout, the player and the background, yielding the number of completed steps after each one.
+
+        The level must be completely built before running it.
+
+        Arguments:
+        assets -- the level assets, already read by the loader
+        """
+        level_data = assets.level_data
+        layouts = assets.layouts
+        self.assets = assets
 
         # Level barriers
-        barrier_layout = import_csv_layout(level_data['barriers'])
+        barrier_layout = layouts['barriers']
         self.barrier_sprites = self.create_tile_group(barrier_layout, 'barriers')
+        yield 1
 
         # Terrain setup
-        terrain_layout = import_csv_layout(level_data['terrain'])
+        terrain_layout = layouts['terrain']
         self.terrain_sprites = self.create_tile_group(terrain_layout, 'terrain')
+        yield 2
         # Background terrain setup
-        bg_terrain_layout = import_csv_layout(level_data['background'])
+        bg_terrain_layout = layouts['background']
         self.background_sprites = self.create_tile_group(bg_terrain_layout, 'background')
+        yield 3
         # Building setup
-        building_layout = import_csv_layout(level_data['buildings'])
+        building_layout = layouts['buildings']
         self.building_sprites = self.create_tile_group(building_layout, 'terrain')
+        yield 4
         # Roof setup
-        roof_layout = import_csv_layout(level_data['roofs'])
+        roof_layout = layouts['roofs']
         self.roof_sprites = self.create_tile_group(roof_layout, 'roofs')
+        yield 5
         # Decoration setup
-        decoration_layout = import_csv_layout(level_data['decoration'])
+        decoration_layout = layouts['decoration']
         self.decoration_sprites = self.create_tile_group(decoration_layout, 'terrain')
+        yield 6
         # Root setup
-        root_layout = import_csv_layout(level_data['roots'])
+        root_layout = layouts['roots']
         self.root_sprites = self.create_tile_group(root_layout, 'terrain')
+        yield 7
         # Grass setup
-        grass_layout = import_csv_layout(level_data['grass'])
+        grass_layout = layouts['grass']
         self.grass_sprites = self.create_tile_group(grass_layout, 'grass')
+        yield 8
         # Energy setup
-        energy_layout = import_csv_layout(level_data['energy'])
+        energy_layout = layouts['energy']
         self.energy_sprites = self.create_tile_group(energy_layout, 'energy')
+        yield 9
         # Tree setup
-        tree_layout = import_csv_layout(level_data['trees'])
+        tree_layout = layouts['trees']
         self.tree_sprites = self.create_tile_group(tree_layout, 'trees')
+        yield 10
 
         # Enemies
-        enemy_layout = import_csv_layout(level_data['enemies'])
+        enemy_layout = layouts['enemies']
         self.enemy_sprites = self.create_tile_group(enemy_layout, 'enemies')
+        yield 11
         # Enemy borders
-        border_layout = import_csv_layout(level_data['borders'])
-        self.border_sprites = self.create_tile_group(border_layout, 'borders')
+        border_layout = layouts['borders']
+        self.patrol_map = PatrolMap(border_layout, tile_size)
+        for enemy in self.enemy_sprites.sprites():
+            enemy.patrol = self.patrol_map.get_patrol(enemy.rect)
+        yield 12
 
         # Background
         self.sky = Sky(level_data['horizon'], self.scene)
@@ -109,34 +223,50 @@ class Level:
         self.water = Water(screen_height - 52, self.scene, level_width, level_data['enable_water'])
         self.clouds = Clouds(320, self.scene, level_width, random.randint(0, 32))
         self.mountains = Mountains(192, self.scene, level_width, level_data['enable_mountains'])
+        yield 13
 
         # Terrain optimization
         self.internal_terrain_sprites = pygame.sprite.Group()
-        self.optimize_internal_terrain()
+        self.optimize_internal_terrain(terrain_layout)
         for sprite in self.internal_terrain_sprites.sprites():
             self.terrain_sprites.remove(sprite)
+        # Collision grid
+        self.collision_grid = CollisionGrid([self.terrain_sprites, self.barrier_sprites], tile_size)
+        yield 14
+
+        # Static layer baking (the layers are baked in the order they used to be drawn in)
+        static_groups = [self.terrain_sprites, self.internal_terrain_sprites, self.background_sprites, self.building_sprites, self.roof_sprites, self.decoration_sprites, self.root_sprites, self.grass_sprites, self.tree_sprites]
+        self.chunk_sprites = bake_chunks(static_groups, chunk_width, screen_height)
+        # Culling indexes (the sprites of these groups never move)
+        for group in (self.chunk_sprites, self.energy_sprites, self.water.water_sprites, self.mountains.mountain_sprites):
+            self.camera.add_static(group)
+        yield 15
 
         # Player setup
-        player_layout = import_csv_layout(level_data['setup'])
+        player_layout = layouts['setup']
         self.player = pygame.sprite.GroupSingle()
         self.player_end = pygame.sprite.GroupSingle()
         self.setup_player(player_layout, self)
         self.ranged_sprites = pygame.sprite.Group()
         self.magical_sprites = pygame.sprite.Group()
+        self.projectile_pool = ProjectilePool(projectile_pool_size)
         # Player particles
+        self.particle_pool = ParticlePool(particle_pool_size)
         self.dust_sprite = pygame.sprite.GroupSingle()
         self.player_on_ground = False
         # Enemy particles
         self.enemy_death_sprites = pygame.sprite.Group()
+        yield 16
 
         # SFX
-        self.energy_pickup_sfx = pygame.mixer.Sound('./assets/audio/sfx/energy_pickup.ogg')
+        self.energy_pickup_sfx = asset_manager.load_sound('./assets/audio/sfx/energy_pickup.ogg')
         self.energy_pickup_sfx.set_volume(0.5)
-        self.enemy_death_sfx = pygame.mixer.Sound('./assets/audio/sfx/enemy_death.ogg')
-        self.player_death_sfx = pygame.mixer.Sound('./assets/audio/sfx/player_death.ogg')
+        self.enemy_death_sfx = asset_manager.load_sound('./assets/audio/sfx/enemy_death.ogg')
+        self.player_death_sfx = asset_manager.load_sound('./assets/audio/sfx/player_death.ogg')
+        yield 17
 
         # Music
-        pygame.mixer.music.load(level_data['music'])
+        pygame.mixer.music.load(assets.music)
         pygame.mixer.music.set_volume(float(self.volume))
         pygame.mixer.music.play(-1, fade_ms=2000)
 
@@ -193,10 +323,11 @@ class Level:
         self.status = 'pause'
 
     def create_inventory(self):
-        """Build the inventory screen."""
+        """Open the inventory screen and pause the game."""
         pygame.mixer.music.set_volume(float(self.volume)/2)
         self.pause_start = pygame.time.get_ticks()
-        self.inventory_screen = Inventory(self.display_surface, self.parent)
+        self.inventory_screen = self.parent.inventory_screen
+        self.inventory_screen.open()
         self.status = 'inventory'
 
     def fade_in(self, amount):
@@ -236,12 +367,12 @@ class Level:
             for col_index, col in enumerate(row):
                 x = col_index * tile_size
                 y = row_index * tile_size
-                if col == '0':
+                if col == 0:
                     sprite = Player((x, y+tile_size-1), self.display_surface, self.create_jump_particles, self.controller, parent)
                     self.player.add(sprite)
-                if col == '1':
+                if col == 1:
                     scene_conversion_table = {'day': 'day', 'night': 'night', 'dawn': 'dawn_dusk', 'dusk': 'dawn_dusk'}
-                    cross_surface = pygame.image.load(f'./assets/level/ground/cross_{scene_conversion_table[self.scene]}.png')
+                    cross_surface = asset_manager.load_image(f'./assets/level/ground/cross_{scene_conversion_table[self.scene]}.png', 'none')
                     sprite = StaticTile(tile_size, x, y, cross_surface)
                     self.player_end.add(sprite)
 
@@ -255,8 +386,9 @@ class Level:
             pos -= pygame.Vector2(0, 32)
         else:
             pos += pygame.Vector2(0, -32)
-        jump_particle_sprite = Particle(pos, 'jump')
-        self.dust_sprite.add(jump_particle_sprite)
+        jump_particle_sprite = self.particle_pool.get(pos, 'jump')
+        if jump_particle_sprite is not None:
+            self.dust_sprite.add(jump_particle_sprite)
 
     def create_fall_particle(self):
         """Spawn the fall particles."""
@@ -265,8 +397,9 @@ class Level:
                 offset = pygame.Vector2(0, 32)
             else:
                 offset = pygame.Vector2(0, 32)
-            fall_particle = Particle(self.player.sprite.rect.midbottom - offset, 'fall')
-            self.dust_sprite.add(fall_particle)
+            fall_particle = self.particle_pool.get(self.player.sprite.rect.midbottom - offset, 'fall')
+            if fall_particle is not None:
+                self.dust_sprite.add(fall_particle)
 
     def get_player_on_ground(self):
         """Get whether the player is on the ground."""
@@ -279,14 +412,19 @@ class Level:
         """Make a group to hold in the sprites and return it.
 
         Arguments:
-        layout -- the level layout to use
+        layout -- the level layout to use (None for an empty layer)
         type -- the type of the group
         """
         sprite_group = pygame.sprite.Group()
+        if layout is None:
+            return sprite_group
         scene_conversion_table = {'day': 'day', 'night': 'night', 'dawn': 'dawn_dusk', 'dusk': 'dawn_dusk'}
+        scene = scene_conversion_table[self.scene]
+        if type in tile_atlases:
+            tile_list = atlas_cache.get(f'./assets/level/ground/{tile_atlases[type]}_{scene}.png', scene)
         for row_index, row in enumerate(layout):
             for col_index, col in enumerate(row):
-                if col != '-1':
+                if col != -1:
                     add_sprite_to_group = True
                     x = col_index * tile_size
                     y = row_index * tile_size
@@ -294,117 +432,75 @@ class Level:
                     if type == 'barriers':
                         sprite = Tile(tile_size, x, y)
 
-                    elif type == 'terrain':
-                        terrain_list = import_sliced_graphics(f'./assets/level/ground/ground_{scene_conversion_table[self.scene]}.png')
-                        tile_surface = terrain_list[int(col)]
-                        sprite = StaticTile(tile_size, x, y, tile_surface)
-                    elif type == 'background':
-                        bg_terrain_list = import_sliced_graphics(f'./assets/level/ground/bg_{scene_conversion_table[self.scene]}.png')
-                        tile_surface = bg_terrain_list[int(col)]
-                        sprite = StaticTile(tile_size, x, y, tile_surface)
-                    elif type == 'roofs':
-                        roof_list = import_sliced_graphics(f'./assets/level/ground/roofs_{scene_conversion_table[self.scene]}.png')
-                        tile_surface = roof_list[int(col)]
-                        sprite = StaticTile(tile_size, x, y, tile_surface)
-                    elif type == 'grass':
-                        grass_list = import_sliced_graphics(f'./assets/level/ground/grass_{scene_conversion_table[self.scene]}.png')
-                        tile_surface = grass_list[int(col)]
+                    elif type in tile_atlases:
+                        tile_surface = tile_list[col]
                         sprite = StaticTile(tile_size, x, y, tile_surface)
                     elif type == 'trees':
-                        sprite = Tree(tile_size, x, y, f'./assets/level/ground/tree_{scene_conversion_table[self.scene]}.png', random.randrange(160, 192, 8))
+                        sprite = Tree(tile_size, x, y, f'./assets/level/ground/tree_{scene}.png', random.randrange(160, 192, 8))
 
                     elif type == 'energy':
-                        if col == '0':
+                        if col == 0:
                             sprite = Energy(tile_size, x, y, './assets/level/energy/blue', 2)
-                        elif col == '1':
+                        elif col == 1:
                             sprite = Energy(tile_size, x, y, './assets/level/energy/red', 5)
-                        elif col == '2':
+                        elif col == 2:
                             sprite = Energy(tile_size, x, y, './assets/level/energy/yellow', 10)
-                        elif col == '3':
+                        elif col == 3:
                             sprite = Energy(tile_size, x, y, './assets/level/energy/green', 20)
 
                     elif type == 'enemies':
-                        if col == '1':
-                            sprite = Skeleton(tile_size, x, y, f'./assets/enemy/skeleton/{scene_conversion_table[self.scene]}', 64, self)
-                        elif col == '2':
-                            sprite = Zombie(tile_size, x, y, f'./assets/enemy/zombie/{scene_conversion_table[self.scene]}', 64, self)
-                    elif type == 'borders':
-                        sprite = Tile(tile_size, x, y)
+                        if col == 1:
+                            path = f'./assets/enemy/skeleton/{scene}'
+                            sprite = Skeleton(tile_size, x, y, path, 64, self)
+                        elif col == 2:
+                            path = f'./assets/enemy/zombie/{scene}'
+                            sprite = Zombie(tile_size, x, y, path, 64, self)
 
                     if add_sprite_to_group:
                         sprite_group.add(sprite)
-            pygame.event.pump()
         return sprite_group
 
-    def optimize_internal_terrain(self):
-        """Optimize the internal terrain by detecting it and putting it in a separate group where collision isn't checked."""
+    def optimize_internal_terrain(self, layout):
+        """Optimize the internal terrain by detecting it and putting it in a separate group where collision isn't checked.
+
+        Arguments:
+        layout -- the terrain layout the terrain sprites were created from
+        """
+        internal_tiles = find_internal_tiles(layout, screen_height // tile_size - 1)
         for target_tile in self.terrain_sprites.sprites():
-            topleft_tile = False
-            top_tile = False
-            topright_tile = False
-            left_tile = False
-            right_tile = False
-            bottomleft_tile = False
-            bottom_tile = False
-            bottomright_tile = False
-            for sprite in self.terrain_sprites.sprites():
-                if sprite.rect.collidepoint(target_tile.rect.topleft - pygame.Vector2(32, 32)):
-                    topleft_tile = True
-                elif sprite.rect.collidepoint(target_tile.rect.midtop - pygame.Vector2(0, 32)):
-                    top_tile = True
-                elif sprite.rect.collidepoint(target_tile.rect.topright - pygame.Vector2(-32, 32)):
-                    topright_tile = True
-                elif sprite.rect.collidepoint(target_tile.rect.midleft - pygame.Vector2(32, 0)):
-                    left_tile = True
-                elif sprite.rect.collidepoint(target_tile.rect.midright + pygame.Vector2(32, 0)):
-                    right_tile = True
-                elif sprite.rect.collidepoint(target_tile.rect.bottomleft + pygame.Vector2(-32, 32)):
-                    bottomleft_tile = True
-                elif sprite.rect.collidepoint(target_tile.rect.midbottom + pygame.Vector2(0, 32)):
-                    bottom_tile = True
-                elif sprite.rect.collidepoint(target_tile.rect.bottomright + pygame.Vector2(32, 32)):
-                    bottomright_tile = True
-            if topleft_tile and top_tile and topright_tile and left_tile and right_tile and bottomleft_tile and bottom_tile and bottomright_tile:
-                self.internal_terrain_sprites.add(target_tile)
-            elif target_tile.rect.bottom == screen_height and topleft_tile and top_tile and topright_tile and left_tile and right_tile:
+            if (target_tile.rect.y // tile_size, target_tile.rect.x // tile_size) in internal_tiles:
                 self.internal_terrain_sprites.add(target_tile)
 
     def apply_enemy_border_collision(self):
         """Reverse the enemies if they run into a border tile."""
         for enemy in self.enemy_sprites.sprites():
-            if pygame.sprite.spritecollide(enemy, self.border_sprites, False):
+            if enemy.check_border_collision():
                 enemy.reverse()
 
     def x_mov_coll(self):
         """Check the player horizontal movement collision and set the correct flags."""
         player = self.player.sprite
         player.collision_rect.x += player.direction.x * player.target_speed
-        # collidables = self.terrain_sprites.sprites() + self.whatever.sprites()
-        # for sprite in collidables: collision code
-        collidables = self.terrain_sprites.sprites() + self.barrier_sprites.sprites()
-        for sprite in collidables:
-            if sprite.rect.colliderect(player.collision_rect):
-                if player.direction.x < 0:
-                    player.collision_rect.left = sprite.rect.right
-                elif player.direction.x > 0:
-                    player.collision_rect.right = sprite.rect.left
+        # The collidable groups are indexed in 'self.collision_grid'
+        for sprite in self.collision_grid.collide(player.collision_rect):
+            if player.direction.x < 0:
+                player.collision_rect.left = sprite.rect.right
+            elif player.direction.x > 0:
+                player.collision_rect.right = sprite.rect.left
 
     def y_mov_coll(self):
         """Check the player vertical movement collision and set the correct flags."""
         player = self.player.sprite
         player.apply_gravity()
-        # See above for multiple collidable sprites
-        collidables = self.terrain_sprites.sprites() + self.barrier_sprites.sprites()
-        for sprite in collidables:
-            if sprite.rect.colliderect(player.collision_rect):
-                if player.direction.y > 0:
-                    player.collision_rect.bottom = sprite.rect.top
-                    player.direction.y = 0
-                    player.on_ground = True
-                    player.jumping = False
-                elif player.direction.y < 0:
-                    player.collision_rect.top = sprite.rect.bottom
-                    player.direction.y = 0
+        for sprite in self.collision_grid.collide(player.collision_rect):
+            if player.direction.y > 0:
+                player.collision_rect.bottom = sprite.rect.top
+                player.direction.y = 0
+                player.on_ground = True
+                player.jumping = False
+            elif player.direction.y < 0:
+                player.collision_rect.top = sprite.rect.bottom
+                player.direction.y = 0
 
         # Checks if the player is jumping or falling
         if player.on_ground and player.direction.y < 0 or player.direction.y > 3:
@@ -417,7 +513,7 @@ class Level:
         speed -- the speed the camera is scrolling and the player is moving
         """
         player = self.player.sprite
-        player_x = player.rect.centerx
+        player_x = player.rect.centerx - self.camera.x
         direction_x = player.direction.x
         if player_x < screen_width / 2.5 and direction_x < 0:
             self.shift = speed
@@ -429,6 +525,13 @@ class Level:
             self.shift = 0
             player.target_speed = speed
 
+    def apply_scroll(self):
+        """Scroll the camera by the shift set in the last frame and move the player along, so that they keep their position on screen."""
+        self.camera.scroll(self.shift)
+        player = self.player.sprite
+        player.collision_rect.x -= self.shift
+        player.rect.x -= self.shift
+
     def increase_energy(self, amount):
         """Add energy to the player.
 
@@ -500,10 +603,9 @@ class Level:
     def check_enemy_ranged_collisions(self):
         """Check if the ranged weapon projectiles are valid, then check if they collide with the enemies."""
         for projectile in self.ranged_sprites:
-            if abs((self.start_x-projectile.rect.x)*-1 - projectile.start_x) > self.parent.selection['ranged'].range:
+            if abs(projectile.rect.x - projectile.start_x) > self.parent.selection['ranged'].range:
                 projectile.kill()
-            collidables = self.terrain_sprites.sprites() + self.barrier_sprites.sprites()
-            if pygame.sprite.spritecollideany(projectile, collidables) is not None:
+            if self.collision_grid.sweep(projectile.rect, projectile.previous_pos) is not None:
                 projectile.kill()
         enemy_collisions = pygame.sprite.groupcollide(self.ranged_sprites, self.enemy_sprites, False, False)
         if enemy_collisions:
@@ -523,10 +625,9 @@ class Level:
     def check_enemy_magical_collisions(self):
         """Check if the magical weapon projectiles are valid, then check if they collide with the enemies."""
         for projectile in self.magical_sprites:
-            if abs((self.start_x-projectile.rect.x)*-1 - projectile.start_x) > self.parent.selection['magical'].range:
+            if abs(projectile.rect.x - projectile.start_x) > self.parent.selection['magical'].range:
                 projectile.kill()
-            collidables = self.terrain_sprites.sprites() + self.barrier_sprites.sprites()
-            if pygame.sprite.spritecollideany(projectile, collidables) is not None:
+            if self.collision_grid.sweep(projectile.rect, projectile.previous_pos) is not None:
                 projectile.kill()
         enemy_collisions = pygame.sprite.groupcollide(self.magical_sprites, self.enemy_sprites, False, False)
         if enemy_collisions:
@@ -556,8 +657,7 @@ class Level:
             facing_right = False
         pos -= pygame.Vector2(0, 16)  # This allows for the projectile to be shot from higher up
         speed = self.parent.selection['ranged'].speed
-        start_x = (self.start_x - pos[0]) * -1
-        ranged_projectile = Projectile(image, pos, speed, facing_right, start_x)
+        ranged_projectile = self.projectile_pool.get(image, pos, speed, facing_right)
         self.ranged_sprites.add(ranged_projectile)
 
     def create_magical_projectile(self):
@@ -571,16 +671,16 @@ class Level:
             facing_right = False
         pos -= pygame.Vector2(0, 16)  # This allows for the projectile to be shot from higher up
         speed = self.parent.selection['magical'].speed
-        start_x = (self.start_x - pos[0]) * -1
-        magical_projectile = Projectile(image, pos, speed, facing_right, start_x, True)
+        magical_projectile = self.projectile_pool.get(image, pos, speed, facing_right, True)
         self.magical_sprites.add(magical_projectile)
 
     def check_enemy_death(self):
         """Check if the enemies should be dead and kill their sprites if that is the case."""
         for enemy in self.enemy_sprites.sprites():
             if enemy.health <= 0:
-                death_particle = Particle(enemy.rect.center, 'enemy_death')
-                self.enemy_death_sprites.add(death_particle)
+                death_particle = self.particle_pool.get(enemy.rect.center, 'enemy_death')
+                if death_particle is not None:
+                    self.enemy_death_sprites.add(death_particle)
                 enemy.kill()
                 if self.current_level >= self.end_level and not self.parent.loaded_from_savefile:
                     self.increase_energy(enemy.energy + enemy.toughness)
@@ -632,61 +732,39 @@ class Level:
         """
         self.delta = delta
         if self.status == 'level':
-            # Level barriers
-            self.barrier_sprites.update(self.shift)
+            # Camera
+            self.camera.reset_stats()
+            self.apply_scroll()
+            self.projectile_pool.collect()
 
             # Background
             self.sky.draw(self.display_surface, self.scene)
-            self.mountains.draw(self.display_surface, int(self.shift / 3))
-            self.water.draw(self.display_surface, int(self.shift / 3), self.delta)
-            self.clouds.draw(self.display_surface, int(self.shift / 3))
+            self.mountains.draw(self.display_surface, self.camera)
+            self.water.draw(self.display_surface, self.camera, self.delta)
+            self.clouds.draw(self.display_surface, self.camera)
 
             # Particles
-            self.dust_sprite.update(self.shift, self.delta)
-            self.dust_sprite.draw(self.display_surface)
-
-            # Terrain
-            self.terrain_sprites.update(self.shift)
-            self.terrain_sprites.draw(self.display_surface)
-            self.internal_terrain_sprites.update(self.shift)
-            self.internal_terrain_sprites.draw(self.display_surface)
-            # Background terrain
-            self.background_sprites.update(self.shift)
-            self.background_sprites.draw(self.display_surface)
-            # Buildings
-            self.building_sprites.update(self.shift)
-            self.building_sprites.draw(self.display_surface)
-            # Roofs
-            self.roof_sprites.update(self.shift)
-            self.roof_sprites.draw(self.display_surface)
-            # Decoration
-            self.decoration_sprites.update(self.shift)
-            self.decoration_sprites.draw(self.display_surface)
-            # Roots
-            self.root_sprites.update(self.shift)
-            self.root_sprites.draw(self.display_surface)
-            # Grass
-            self.grass_sprites.update(self.shift)
-            self.grass_sprites.draw(self.display_surface)
-            # Trees
-            self.tree_sprites.update(self.shift)
-            self.tree_sprites.draw(self.display_surface)
-            # Energy
-            self.energy_sprites.update(self.shift, self.delta)
+            self.dust_sprite.update(self.delta)
+            self.camera.draw(self.dust_sprite, self.display_surface)
+
+            # Static layers (terrain, background terrain, buildings, roofs, decoration, roots, grass and trees)
+            self.camera.draw(self.chunk_sprites, self.display_surface)
+            # Energy (only the energy on screen is animated, as it doesn't affect the game)
+            visible_energy = self.camera.get_visible(self.energy_sprites)
+            for energy in visible_energy:
+                energy.update(self.delta)
             if self.current_level >= self.end_level and not self.parent.loaded_from_savefile:
-                self.energy_sprites.draw(self.display_surface)
+                self.camera.draw(self.energy_sprites, self.display_surface, visible=visible_energy)
                 self.check_energy_collisions()
             # Enemies
-            self.enemy_sprites.update(self.shift, self.delta)
-            self.border_sprites.update(self.shift)
+            self.enemy_sprites.update(self.delta)
             self.apply_enemy_border_collision()
-            self.enemy_sprites.draw(self.display_surface)
-            self.enemy_death_sprites.update(self.shift, self.delta)
-            self.enemy_death_sprites.draw(self.display_surface)
+            self.camera.draw(self.enemy_sprites, self.display_surface)
+            self.enemy_death_sprites.update(self.delta)
+            self.camera.draw(self.enemy_death_sprites, self.display_surface)
 
             # End tile
-            self.player_end.update(self.shift)
-            self.player_end.draw(self.display_surface)
+            self.camera.draw(self.player_end, self.display_surface)
             # Player
             self.player.update()
             self.x_mov_coll()
@@ -694,16 +772,16 @@ class Level:
             self.y_mov_coll()
             self.create_fall_particle()
             self.scroll_x(int(self.player.sprite.speed*self.delta))
-            self.start_x += self.shift
             # The code below allows for adjusting the player blitting position when melee attacking and facing left so that the player doesn't "slide" right
-            if self.player.sprite.melee_attacking and not self.player.sprite.facing_right:
-                self.display_surface.blit(self.player.sprite.image, self.player.sprite.rect.topleft - pygame.Vector2(self.parent.selection['melee'].range, 0))
-            else:
-                self.player.draw(self.display_surface)  # Normal draw routine
-            self.ranged_sprites.update(self.shift, self.delta)
-            self.ranged_sprites.draw(self.display_surface)
-            self.magical_sprites.update(self.shift, self.delta)
-            self.magical_sprites.draw(self.display_surface)
+            if self.player.sprite.visible:  # The player is hidden every other frame while flickering
+                if self.player.sprite.melee_attacking and not self.player.sprite.facing_right:
+                    self.display_surface.blit(self.player.sprite.image, self.camera.apply(self.player.sprite.rect).topleft - pygame.Vector2(self.parent.selection['melee'].range, 0))
+                else:
+                    self.camera.draw(self.player, self.display_surface)  # Normal draw routine
+            self.ranged_sprites.update(self.delta)
+            self.camera.draw(self.ranged_sprites, self.display_surface)
+            self.magical_sprites.update(self.delta)
+            self.camera.draw(self.magical_sprites, self.display_surface)
 
             # Enemy routines
             self.check_enemy_collisions()
@@ -0,0 +1,234 @@
+import pygame
+import threading
+import io
+from settings import screen_width
+from cache import atlas_cache, frame_store, mirror_cache, tile_atlases
+from assetmanager import asset_manager
+from bundle import import_level_layouts
+from particles import particle_folders
+
+"""This file contains the level loader, which reads the level files on a worker thread, the prefetcher driven by the world map and the loading screen shown while the level is built."""
+
+# The tile group type every layer using a tile atlas is built as
+atlas_layers = {'terrain': 'terrain', 'background': 'background', 'buildings': 'terrain', 'roofs': 'roofs', 'decoration': 'terrain', 'roots': 'terrain', 'grass': 'grass'}
+# The frame folder of every enemy in the enemy layer
+enemy_folders = {1: 'skeleton', 2: 'zombie'}
+# The frame folder of every energy item in the energy layer
+energy_folders = {0: 'blue', 1: 'red', 2: 'yellow', 3: 'green'}
+
+class LevelAssets:
+    """The level assets, which are read and sliced on a worker thread so that the game keeps running while they load."""
+    def __init__(self, level_data):
+        """Setup the assets and the worker thread.
+
+        Arguments:
+        level_data -- the level data, as defined in 'data.py'
+        """
+        self.level_data = level_data
+        scene_conversion_table = {'day': 'day', 'night': 'night', 'dawn': 'dawn_dusk', 'dusk': 'dawn_dusk'}
+        self.scene = scene_conversion_table[level_data['scene']]
+        self.layouts = None
+        self.music = None
+        self.steps = 3 + len(tile_atlases)
+        self.completed_steps = 0
+        self.done = False
+        self.cancelled = False
+        self.error = None
+        self.atlas_keys = []  # The atlases this load added to the atlas cache
+        self.frame_paths = []  # The animation folders this load added to the frame store
+        self.lock = threading.Lock()  # Guards the cancelled and done flags, so that the assets are dropped exactly once
+        self.thread = threading.Thread(target=self.load, daemon=True)
+
+    def start(self):
+        """Start reading the assets on the worker thread."""
+        self.thread.start()
+
+    def load(self):
+        """Read the level layouts, slice the tile atlases they need, import the animation frames into the frame store and read the music (runs on the worker thread)."""
+        try:
+            self.layouts = import_level_layouts(self.level_data)
+            self.completed_steps += 1
+            for type, atlas in tile_atlases.items():
+                if self.cancelled:
+                    return
+                if any(self.layouts[layer] is not None for layer, layer_type in atlas_layers.items() if layer_type == type):
+                    path = f'./assets/level/ground/{atlas}_{self.scene}.png'
+                    if not atlas_cache.contains(path, self.scene):
+                        self.atlas_keys.append((path, self.scene))
+                    atlas_cache.get(path, self.scene)
+                self.completed_steps += 1
+            # The enemies and the water are drawn for a single scene, so they are dropped when the scene changes
+            paths = []
+            if self.layouts['enemies'] is not None:
+                paths += [(f'./assets/enemy/{enemy_folders[enemy]}/{self.scene}', self.scene) for enemy in set(col for row in self.layouts['enemies'] for col in row if col in enemy_folders)]
+            if self.layouts['energy'] is not None:
+                paths += [(f'./assets/level/energy/{energy_folders[energy]}', None) for energy in set(col for row in self.layouts['energy'] for col in row if col in energy_folders)]
+            if self.level_data['enable_water']:
+                paths.append((f'./assets/level/water/{self.scene}', self.scene))
+            paths += [(path, None) for path in particle_folders.values()]  # The particles are imported in advance so that the first jump doesn't wait for the disk
+            for path, scene in paths:
+                if self.cancelled:
+                    return
+                if not frame_store.contains(path):
+                    self.frame_paths.append(path)
+                frame_store.get(path, scene)
+            self.completed_steps += 1
+            if self.cancelled:
+                return
+            # The music is streamed while playing, so only the file is read in advance
+            with open(self.level_data['music'], 'rb') as music:
+                self.music = io.BytesIO(music.read())
+            self.completed_steps += 1
+        except Exception as error:
+            self.error = error  # The error is raised again on the main thread, where the crash handler can catch it
+        finally:
+            with self.lock:
+                self.done = True
+                if self.cancelled:
+                    self.release()
+
+    def cancel(self):
+        """Stop the worker thread as soon as it finishes its current step and drop the assets it added to the caches."""
+        with self.lock:
+            self.cancelled = True
+            # If the worker thread is still running, it drops the assets itself when it stops
+            if self.done:
+                self.release()
+
+    def release(self):
+        """Remove from the caches the atlases and the animations this load added to them (must be called with the lock held)."""
+        atlas_cache.discard(self.atlas_keys)
+        frame_store.discard(self.frame_paths)
+        mirror_cache.discard(self.frame_paths)
+        self.atlas_keys = []
+        self.frame_paths = []
+
+    def adopt(self):
+        """Drop the atlases and the animations of every other scene, as the level being loaded is the one which will be played (must be called on the main thread)."""
+        atlas_cache.switch_scene(self.scene)
+        mirror_cache.discard(frame_store.switch_scene(self.scene))
+
+    def get_progress(self):
+        """Return the fraction of the assets which have already been read."""
+        return self.completed_steps / self.steps
+
+    def check_error(self):
+        """Raise on the main thread the error which stopped the worker thread, if any."""
+        if self.error is not None:
+            raise self.error
+
+class LevelPrefetcher:
+    """The level prefetcher, which starts loading the level under the world map cursor before it is selected.
+
+    Only one level is prefetched at a time, so moving the cursor cancels the previous prefetch and drops its assets.
+    """
+    def __init__(self):
+        """Setup the prefetcher."""
+        self.level_id = None
+        self.assets = None
+
+    def prefetch(self, level_data, current_level, current_subpart, current_part):
+        """Start loading a level in the background, unless it is already being loaded.
+
+        Arguments:
+        level_data -- the level data, as defined in 'data.py'
+        current_level -- the level to prefetch
+        current_subpart -- the subpart the level is in
+        current_part -- the part the level is in
+        """
+        level_id = (current_level, current_subpart, current_part)
+        if level_id != self.level_id:
+            self.cancel()
+            self.level_id = level_id
+            self.assets = LevelAssets(level_data)
+            self.assets.start()
+
+    def cancel(self):
+        """Cancel the current prefetch and drop its assets."""
+        if self.assets is not None:
+            self.assets.cancel()
+        self.level_id = None
+        self.assets = None
+
+    def take(self, current_level, current_subpart, current_part):
+        """Return the prefetched assets of a level after switching the caches to its scene, or None if another level (or no level) was prefetched.
+
+        Arguments:
+        current_level -- the level to load
+        current_subpart -- the subpart the level is in
+        current_part -- the part the level is in
+        """
+        assets = None
+        if self.level_id == (current_level, current_subpart, current_part) and self.assets.error is None:
+            assets = self.assets
+            assets.adopt()
+            self.level_id = None
+            self.assets = None
+        else:
+            self.cancel()
+        return assets
+
+class LoadingScreen:
+    """The loading screen, which finishes building a level a few steps per frame while displaying its progress."""
+    def __init__(self, display_surface, level, assets):
+        """Setup the loading screen.
+
+        Arguments:
+        display_surface -- the screen
+        level -- the level to build
+        assets -- the assets the level is built from
+        """
+        self.display_surface = display_surface
+        self.level = level
+        self.assets = assets
+        self.builder = None
+        self.build_progress = 0
+        self.done = False
+        self.frame_budget = 12  # The time to spend building the level each frame, measured in milliseconds
+        self.loading_screen = asset_manager.load_image('./assets/ui/loading.png')
+        self.loading_rect = self.loading_screen.get_rect(topleft=(64, 64))
+        self.bar_rect = pygame.Rect(self.loading_rect.left, self.loading_rect.bottom + 32, screen_width - 128, 16)
+        self.displayed_progress = 0
+
+    def build(self):
+        """Run the level build steps until the frame budget is spent."""
+        if self.builder is None:
+            self.builder = self.level.build(self.assets)
+        start = pygame.time.get_ticks()
+        while True:
+            try:
+                self.build_progress = next(self.builder) / self.level.build_steps
+            except StopIteration:
+                self.build_progress = 1
+                self.done = True
+                return
+            if pygame.time.get_ticks() - start >= self.frame_budget:
+                return
+
+    def get_progress(self):
+        """Return the fraction of the level which has already been loaded."""
+        return (self.assets.get_progress() + self.build_progress) / 2
+
+    def draw(self):
+        """Draw the loading screen and its progress bar."""
+        self.display_surface.fill('black')
+        self.display_surface.blit(self.loading_screen, self.loading_rect)
+        # The bar eases towards the real progress so that it keeps moving between steps
+        self.displayed_progress += (self.get_progress() - self.displayed_progress) * 0.25
+        pygame.draw.rect(self.display_surface, 'white', self.bar_rect, 2)
+        inner_rect = self.bar_rect.inflate(-8, -8)
+        # A grey marker sweeps the bar back and forth to show that the game is still running during long steps
+        sweep = pygame.time.get_ticks() % 2000 / 1000
+        marker_rect = pygame.Rect(0, inner_rect.top, 32, inner_rect.height)
+        marker_rect.x = inner_rect.left + int((inner_rect.width - marker_rect.width) * (sweep if sweep <= 1 else 2 - sweep))
+        pygame.draw.rect(self.display_surface, '#808080', marker_rect)
+        fill_rect = inner_rect.copy()
+        fill_rect.width = int(inner_rect.width * self.displayed_progress)
+        pygame.draw.rect(self.display_surface, 'white', fill_rect)
+
+    def run(self):
+        """Run the loading screen (must be called every frame)."""
+        self.assets.check_error()
+        if self.assets.done:
+            self.build()
+        self.draw()
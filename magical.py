@@ -1,4 +1,4 @@
-from weapons import MagicalWeapon, Projectile
+from weapons import MagicalWeapon
 
 """This file defines the magical weapons."""
 __all__ = ['StarterStaff']
@@ -31,6 +31,5 @@ class StarterStaff(MagicalWeapon):
     def on_impact(self, kill, pos, facing_right, level_class):
         if kill:
             level_class.player.sprite.heal(0.05*self.level)
-        start_x = (level_class.start_x - pos[0]) * -1
-        new_projectile = Projectile(self.projectile_image, pos, self.speed, facing_right, start_x, False)
+        new_projectile = level_class.projectile_pool.get(self.projectile_image, pos, self.speed, facing_right, False)
         level_class.magical_sprites.add(new_projectile)
@@ -23,9 +23,11 @@ if sys.platform.startswith('win32'):
     import ctypes
     import platform
 from settings import *
+from assetmanager import asset_manager
 from game import Game
 from crash import Crash
 from update import check_updates
+from ui import DebugOverlay
 
 def main():
     # Build identification
@@ -52,12 +54,13 @@ def main():
         elif platform.version().startswith(('6.2', '6.1', '6.0')):
             ctypes.windll.user32.SetProcessDPIAware()  # This makes the window the correct resolution
     screen = pygame.display.set_mode((screen_width, screen_height), pygame.SCALED, vsync=vsync_enabled)
-    icon = pygame.image.load('./icon.png').convert_alpha()
+    icon = asset_manager.load_image('./icon.png')
     pygame.display.set_icon(icon)
     clock = pygame.time.Clock()
     version_id = int(str(build)+str(build_id) if build_id < 10 else str(build) + str(0))
     game = Game(screen, version_id)
     crash = Crash(screen, game)
+    debug_overlay = DebugOverlay(screen)
     crashed = False
     tb = None
     check_updates(version_id, screen)
@@ -78,6 +81,8 @@ def main():
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_F11:
                     pygame.display.toggle_fullscreen()
+                if event.key == pygame.K_F3:
+                    debug_overlay.toggle()
 
         screen.fill('black')
         if not crashed:
@@ -97,6 +102,7 @@ def main():
                 pygame.mixer.stop()
         else:
             crash.run(tb)
+        debug_overlay.draw()
 
         pygame.display.update()
         clock.tick(max_fps)
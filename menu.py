@@ -5,7 +5,9 @@ import configparser
 import os
 import shelve
 from text import render
+from fonts import font_registry, render_cache
 from settings import controllers, screen_height, screen_width
+from assetmanager import asset_manager
 from box import TextBox, SelectionBoxYN
 from versions import get_version, get_level
 
@@ -28,17 +30,17 @@ class Menu:
         self.parent = parent
         self.controllers = self.parent.controller.controllers
         self.gamepad = self.parent.gamepad
-        self.background = pygame.image.load(background).convert_alpha()
-        self.cursor = pygame.image.load(cursor).convert_alpha()
+        self.background = asset_manager.load_image(background)
+        self.cursor = asset_manager.load_image(cursor)
         self.font_file = './font.ttf'
-        self.font = pygame.font.Font(self.font_file, 40)
+        self.font = font_registry.get(self.font_file, 40)
         self.layout = layout
         self.cursor_pos = 0
         self.now = 0  # This is a dummy value
         self.gen_time = pygame.time.get_ticks()
 
         # SFX
-        self.menu_sfx = pygame.mixer.Sound('./assets/audio/sfx/menu_select.ogg')
+        self.menu_sfx = asset_manager.load_sound('./assets/audio/sfx/menu_select.ogg')
 
         # Text attributes
         self.x = 0
@@ -72,7 +74,7 @@ class Menu:
         x = self.x
         y = self.y
         for text in tags:
-            text_surface = self.font.render(text, False, 'white')
+            text_surface = render_cache.render(self.font, text, False, 'white')
             self.display_surface.blit(text_surface, (x, y))
             if self.layout == 'v':
                 y += self.step
@@ -158,10 +160,10 @@ class MainMenu(Menu):
         self.tags = ['New Game', 'Continue', 'Settings', 'Controls', 'Quit']
         self.create_settings = self.parent.create_settings
         self.create_controls = self.parent.create_controls
-        self.title = pygame.image.load('./assets/menu/title.png').convert_alpha()
+        self.title = asset_manager.load_image('./assets/menu/title.png')
         self.copyright_info = "Copyright (C) 2023  BarbeMCR"
         self.status = None
-        self.splash_font = pygame.font.Font(self.font_file, 24)
+        self.splash_font = font_registry.get(self.font_file, 24)
         self.splashes = './splashes.txt'
         with open(self.splashes) as file:
             splashes = file.readlines()
@@ -177,7 +179,7 @@ class MainMenu(Menu):
         x = self.x
         y = self.y
         for text in tags:
-            text_surface = self.font.render(text, False, 'white')
+            text_surface = render_cache.render(self.font, text, False, 'white')
             self.display_surface.blit(text_surface, (x, y))
             if self.layout == 'v':
                 y += self.step
@@ -190,7 +192,7 @@ class MainMenu(Menu):
 
     def display_copyright_info(self):
         """Display the copyright information."""
-        copyright_surface = self.splash_font.render(self.copyright_info, False, 'white')
+        copyright_surface = render_cache.render(self.splash_font, self.copyright_info, False, 'white')
         copyright_rect = copyright_surface.get_rect(bottomright=self.display_surface.get_rect().bottomright)
         self.display_surface.blit(copyright_surface, copyright_rect)
 
@@ -220,7 +222,7 @@ class MainMenu(Menu):
             last_level = get_level(current_part, current_subpart, current_level)
             text = f"Are you sure to load savefile '{self.parent.savefile_path[7:]}'?\nCreated on {creation_time} in version {creation_version}\nLast accessed on {access_time} in version {version}\nCompleted until {last_level}\n\nNever load a savefile from an untrusted source!\nThe savefile will be upgraded to the latest version if necessary.".split('\n')
             self.infobox = SelectionBoxYN(text, self.display_surface, self.parent)
-            self.infobox.font = pygame.font.Font('./font.ttf', 12)
+            self.infobox.font = font_registry.get('./font.ttf', 12)
             self.status = 'infobox'
         else:
             self.status = None
@@ -271,7 +273,7 @@ class Controls(Menu):
         self.y = screen_height - self.font.size(self.tags[0])[1] - 16
         self.step = 64
         self.create_main_menu = self.parent.create_main_menu
-        self.controls_font = pygame.font.Font(self.font_file, 12)
+        self.controls_font = font_registry.get(self.font_file, 12)
         self.controls = [
             "Action:   Keyboard + Mouse   /   Xbox X|S, One, 360   /   DualShock 4   /   Nintendo Switch Pro",
             "",
@@ -293,7 +295,7 @@ class Controls(Menu):
         """Display the control information."""
         y = 32
         for control in self.controls:
-            control_surface = self.controls_font.render(control, False, 'white')
+            control_surface = render_cache.render(self.controls_font, control, False, 'white')
             self.display_surface.blit(control_surface, (64, y))
             y += 24
 
@@ -323,7 +325,7 @@ class PauseMenu(Menu):
         self.tags = ['Resume Game', 'Save Game', 'Save and Quit to Title']
         self.resume_game = self.parent.resume_level
         self.save_game = self.parent.parent.save
-        self.pause_caption_font = pygame.font.Font(self.font_file, 64)
+        self.pause_caption_font = font_registry.get(self.font_file, 64)
         self.pause_caption = "Game Paused"
 
     def exit_game(self):
@@ -333,7 +335,7 @@ class PauseMenu(Menu):
 
     def display_pause_caption(self):
         """Display the pause caption."""
-        pause_caption_surface = self.pause_caption_font.render(self.pause_caption, False, 'white')
+        pause_caption_surface = render_cache.render(self.pause_caption_font, self.pause_caption, False, 'white')
         x = int((screen_width - self.pause_caption_font.size(self.pause_caption)[0]) / 2)
         self.display_surface.blit(pause_caption_surface, (x, 64))
 
@@ -365,8 +367,8 @@ class Settings(Menu):
         self.settings = configparser.ConfigParser()
         self.settings.read('./data/settings.ini')
         self.status = None
-        self.font = pygame.font.Font(self.font_file, 28)
-        self.description_font = pygame.font.Font(self.font_file, 14)
+        self.font = font_registry.get(self.font_file, 28)
+        self.description_font = font_registry.get(self.font_file, 14)
 
     def select_option(self, child):
         """A function used to substitute 'get_input' and simplify the input management.
@@ -443,7 +445,7 @@ class Settings(Menu):
         if os.path.isfile(self.parent.savefile_path + '.dat'):
             os.remove(self.parent.savefile_path + '.dat')
             # self.parent.savefile[7:] is done to avoid displaying the './data/' prefix
-            confirmation = self.font.render(f"Savefile '{self.parent.savefile_path[7:]}' was deleted.", False, 'white')
+            confirmation = render_cache.render(self.font, f"Savefile '{self.parent.savefile_path[7:]}' was deleted.", False, 'white')
             confirmation_rect = confirmation.get_rect(center=self.display_surface.get_rect().center)
             self.display_surface.blit(confirmation, confirmation_rect)
             pygame.display.flip()
@@ -506,27 +508,27 @@ class Settings(Menu):
         elif self.status == 'controller':
             self.controller.run()
             super().run(self.controller.options, self.dummy)
-            self.display_surface.blit(self.description_font.render(self.controller.description, False, 'white'), (128, 32))
+            self.display_surface.blit(render_cache.render(self.description_font, self.controller.description, False, 'white'), (128, 32))
         elif self.status == 'volume':
             self.volume.run()
             super().run(self.volume.options, self.dummy)
-            self.display_surface.blit(self.description_font.render(self.volume.description, False, 'white'), (128, 32))
+            self.display_surface.blit(render_cache.render(self.description_font, self.volume.description, False, 'white'), (128, 32))
         elif self.status == 'vsync':
             self.vsync.run()
             super().run(self.vsync.options, self.dummy)
-            self.display_surface.blit(self.description_font.render(self.vsync.description, False, 'white'), (128, 32))
+            self.display_surface.blit(render_cache.render(self.description_font, self.vsync.description, False, 'white'), (128, 32))
         elif self.status == 'maxfps':
             self.maxfps.run()
             super().run(self.maxfps.options, self.dummy)
-            self.display_surface.blit(self.description_font.render(self.maxfps.description, False, 'white'), (128, 32))
+            self.display_surface.blit(render_cache.render(self.description_font, self.maxfps.description, False, 'white'), (128, 32))
         elif self.status == 'fade':
             self.fade.run()
             super().run(self.fade.options, self.dummy)
-            self.display_surface.blit(self.description_font.render(self.fade.description, False, 'white'), (128, 32))
+            self.display_surface.blit(render_cache.render(self.description_font, self.fade.description, False, 'white'), (128, 32))
         elif self.status == 'autodownload':
             self.autodownload.run()
             super().run(self.autodownload.options, self.dummy)
-            self.display_surface.blit(self.description_font.render(self.autodownload.description, False, 'white'), (128, 32))
+            self.display_surface.blit(render_cache.render(self.description_font, self.autodownload.description, False, 'white'), (128, 32))
         else:
             super().run(self.tags, self.create_controller_settings, self.create_volume_settings, self.create_vsync_settings, self.create_maxfps_settings, self.create_fade_settings, self.create_autodownload_settings, self.create_delete_textbox, self.reset_settings, self.create_main_menu)
 
@@ -3,12 +3,19 @@ import os
 import pygame
 import datetime
 from settings import tile_size
+from assetmanager import asset_manager
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 """This file contains several miscellaneous functions."""
 
 def import_folder(path):
     """Import everything present in a folder with only images and return the list of all imported surfaces.
 
+    The images are read straight from disk, so the folder should be imported through the frame store, which shares them.
+
     Arguments:
     path -- the folder to import
     """
@@ -16,7 +23,7 @@ def import_folder(path):
     for _, _, image_list in os.walk(path):
         for image in image_list:
             full_path = path + '/' + image
-            image_surface = pygame.image.load(full_path).convert_alpha()
+            image_surface, _ = asset_manager.load(full_path, 'alpha')
             surface_list.append(image_surface)
     return surface_list
 
@@ -37,10 +44,13 @@ def import_csv_layout(path):
 def import_sliced_graphics(path):
     """Slice an image atlas and return a list of those slices.
 
+    The slices are subsurfaces, so they share their pixels with the atlas instead of copying them.
+    The atlas is read straight from disk, so it should be sliced through the atlas cache, which shares the slices.
+
     Arguments:
     path -- the image atlas to slice
     """
-    surface = pygame.image.load(path).convert_alpha()
+    surface, _ = asset_manager.load(path, 'alpha')
     tile_num_x = int(surface.get_width() / tile_size)
     tile_num_y = int(surface.get_height() / tile_size)
     sliced_tiles = []
@@ -48,11 +58,48 @@ def import_sliced_graphics(path):
         for col in range(tile_num_x):
             x = col * tile_size
             y = row * tile_size
-            tile_surface = pygame.Surface((tile_size, tile_size), flags = pygame.SRCALPHA)
-            tile_surface.blit(surface, (0, 0), pygame.Rect(x, y, tile_size, tile_size))
+            tile_surface = surface.subsurface(pygame.Rect(x, y, tile_size, tile_size))
             sliced_tiles.append(tile_surface)
     return sliced_tiles
 
+def find_internal_tiles(layout, bottom_row):
+    """Find the tiles completely surrounded by other tiles and return a set with their (row, column) positions.
+
+    A tile on the bottom row only needs to be surrounded on its top, left and right sides.
+    NumPy is used to check all the neighbours at once when it is available.
+
+    Arguments:
+    layout -- the level layout to check
+    bottom_row -- the index of the bottom row of the screen
+    """
+    if numpy is not None:
+        occupied = numpy.array(layout, dtype=numpy.int32) != -1
+        padded = numpy.pad(occupied, 1)
+        height, width = occupied.shape
+        def neighbour(row_offset, col_offset):
+            return padded[1+row_offset:1+row_offset+height, 1+col_offset:1+col_offset+width]
+        upper_sides = neighbour(-1, -1) & neighbour(-1, 0) & neighbour(-1, 1) & neighbour(0, -1) & neighbour(0, 1)
+        lower_sides = neighbour(1, -1) & neighbour(1, 0) & neighbour(1, 1)
+        bottom = numpy.zeros_like(occupied)
+        if 0 <= bottom_row < height:
+            bottom[bottom_row] = True
+        internal = occupied & upper_sides & (lower_sides | bottom)
+        return {(int(row), int(col)) for row, col in zip(*numpy.nonzero(internal))}
+    height = len(layout)
+    width = len(layout[0]) if height else 0
+    padded = [[False] * (width + 2)]
+    for row in layout:
+        padded.append([False] + [col != -1 for col in row] + [False])
+    padded.append([False] * (width + 2))
+    internal_tiles = set()
+    for row in range(1, height + 1):
+        above, current, below = padded[row-1], padded[row], padded[row+1]
+        for col in range(1, width + 1):
+            if current[col] and above[col-1] and above[col] and above[col+1] and current[col-1] and current[col+1]:
+                if row - 1 == bottom_row or (below[col-1] and below[col] and below[col+1]):
+                    internal_tiles.add((row - 1, col - 1))
+    return internal_tiles
+
 def take_screenshot(display_surface):
     """Take a screenshot of the screen and save it to file.
 
@@ -1,8 +1,11 @@
 import pygame
-from misc import import_folder
+from cache import frame_store
 
 """This file defines the particle behavior."""
 
+# The frame folder of every particle type
+particle_folders = {'jump': './assets/player/particles/jump', 'fall': './assets/player/particles/fall', 'enemy_death': './assets/enemy/death'}
+
 class Particle(pygame.sprite.Sprite):
     """The particle builder class."""
     def __init__(self, pos, type):
@@ -13,14 +16,18 @@ class Particle(pygame.sprite.Sprite):
         type -- the type of the particle
         """
         super().__init__()
-        self.frame_index = 0
         self.animation_speed = 0.1
-        if type == 'jump':
-            self.frames = import_folder('./assets/player/particles/jump')
-        if type == 'fall':
-            self.frames = import_folder('./assets/player/particles/fall')
-        if type == 'enemy_death':
-            self.frames = import_folder('./assets/enemy/death')
+        self.reset(pos, type)
+
+    def reset(self, pos, type):
+        """Restart the particle animation, so that the sprite can be reused.
+
+        Arguments:
+        pos -- the position of the particle
+        type -- the type of the particle
+        """
+        self.frame_index = 0
+        self.frames = frame_store.get(particle_folders[type])
         self.image = self.frames[self.frame_index]
         self.rect = self.image.get_rect(center = pos)
     def animate(self, delta):
@@ -34,12 +41,51 @@ class Particle(pygame.sprite.Sprite):
             self.kill()
         else:
             self.image = self.frames[int(self.frame_index)]
-    def update(self, shift, delta):
+    def update(self, delta):
         """Update the particle.
 
         Arguments:
-        shift -- the camera shift
         delta -- the time delta
         """
         self.animate(delta)
-        self.rect.x += shift
+
+class ParticlePool:
+    """The particle pool, which reuses the particle sprites instead of creating a new one for every particle.
+
+    A particle can be reused as soon as it isn't in any group, which happens when its animation ends or when another particle replaces it.
+    """
+    def __init__(self, size):
+        """Setup the pool and its statistics.
+
+        Arguments:
+        size -- the largest number of particles which can exist at once
+        """
+        self.size = size
+        self.particles = []
+        self.created = 0
+        self.reused = 0
+        self.exhausted = 0
+
+    def get(self, pos, type):
+        """Return a particle ready to be added to a group, or None if every particle is still in use.
+
+        Arguments:
+        pos -- the position of the particle
+        type -- the type of the particle
+        """
+        for particle in self.particles:
+            if not particle.alive():
+                particle.reset(pos, type)
+                self.reused += 1
+                return particle
+        if len(self.particles) < self.size:
+            particle = Particle(pos, type)
+            self.particles.append(particle)
+            self.created += 1
+            return particle
+        self.exhausted += 1
+        return None
+
+    def get_stats(self):
+        """Return a dictionary with the pool statistics."""
+        return {'size': self.size, 'created': self.created, 'reused': self.reused, 'exhausted': self.exhausted}
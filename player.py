@@ -1,6 +1,7 @@
 import pygame
 from settings import controllers
-from misc import import_folder
+from cache import frame_store, mirror_cache
+from assetmanager import asset_manager
 
 """This file defines the player behavior."""
 
@@ -25,9 +26,11 @@ class Player(pygame.sprite.Sprite):
         self.base_path = './assets/player/'
         self.character = self.game.character
         self.import_player_assets()
+        self.import_attack_animation()
         self.frame_index = 0
         self.animation_speed = 0.15
         self.image = self.player_assets['idle'][self.frame_index]
+        self.visible = True  # Whether the player is drawn in the current frame, used for the sprite flickering
         self.rect = self.image.get_rect(bottomleft=pos)
         self.collision_rect = pygame.Rect(self.rect)
         self.melee_weapon_rect = pygame.Rect(self.rect.topright, (0, 0))
@@ -35,20 +38,20 @@ class Player(pygame.sprite.Sprite):
         self.gen_time = pygame.time.get_ticks()
 
         # SFX
-        self.jump_sfx = pygame.mixer.Sound('./assets/audio/sfx/jump.ogg')
+        self.jump_sfx = asset_manager.load_sound('./assets/audio/sfx/jump.ogg')
         self.jump_sfx.set_volume(0.25)
-        self.melee_attack_sfx = pygame.mixer.Sound('./assets/audio/sfx/attack_melee.ogg')
+        self.melee_attack_sfx = asset_manager.load_sound('./assets/audio/sfx/attack_melee.ogg')
         self.melee_attack_sfx.set_volume(0.5)
-        self.ranged_attack_sfx = pygame.mixer.Sound('./assets/audio/sfx/attack_ranged.ogg')
+        self.ranged_attack_sfx = asset_manager.load_sound('./assets/audio/sfx/attack_ranged.ogg')
         self.ranged_attack_sfx.set_volume(0.5)
-        self.magical_attack_sfx = pygame.mixer.Sound('./assets/audio/sfx/attack_magical.ogg')
+        self.magical_attack_sfx = asset_manager.load_sound('./assets/audio/sfx/attack_magical.ogg')
         self.magical_attack_sfx.set_volume(0.5)
-        self.player_hurt_sfx = pygame.mixer.Sound('./assets/audio/sfx/player_hurt.ogg')
-        self.enemy_hurt_sfx = pygame.mixer.Sound('./assets/audio/sfx/enemy_hurt.ogg')
-        self.inventory_sfx = pygame.mixer.Sound('./assets/audio/sfx/inventory.ogg')
-        self.game_paused_sfx = pygame.mixer.Sound('./assets/audio/sfx/game_paused.ogg')
-        self.game_resumed_sfx = pygame.mixer.Sound('./assets/audio/sfx/game_resumed.ogg')
-        self.screenshot_taken_sfx = pygame.mixer.Sound('./assets/audio/sfx/screenshot_taken.ogg')
+        self.player_hurt_sfx = asset_manager.load_sound('./assets/audio/sfx/player_hurt.ogg')
+        self.enemy_hurt_sfx = asset_manager.load_sound('./assets/audio/sfx/enemy_hurt.ogg')
+        self.inventory_sfx = asset_manager.load_sound('./assets/audio/sfx/inventory.ogg')
+        self.game_paused_sfx = asset_manager.load_sound('./assets/audio/sfx/game_paused.ogg')
+        self.game_resumed_sfx = asset_manager.load_sound('./assets/audio/sfx/game_resumed.ogg')
+        self.screenshot_taken_sfx = asset_manager.load_sound('./assets/audio/sfx/screenshot_taken.ogg')
 
         # Player movement
         self.direction = pygame.Vector2(0, 0)
@@ -102,48 +105,51 @@ class Player(pygame.sprite.Sprite):
         self.buttondown_share = False
 
     def import_player_assets(self):
-        """Place all the player assets in an easily accessible dictionary."""
+        """Place all the player assets in easily accessible dictionaries, one for each facing."""
         self.player_assets = {'run': [], 'idle': [], 'jump': [], 'fall': []}
+        self.mirrored_player_assets = {}
         scene_conversion_table = {'day': 'day', 'night': 'night', 'dawn': 'dawn_dusk', 'dusk': 'dawn_dusk'}
         for animation in self.player_assets.keys():
             full_path = self.base_path + self.character + '/' + animation + '/' + scene_conversion_table[self.parent.scene]
-            self.player_assets[animation] = import_folder(full_path)
+            self.player_assets[animation] = frame_store.get(full_path)
+            self.mirrored_player_assets[animation] = mirror_cache.get(full_path, self.player_assets[animation])
+
+    def import_attack_animation(self):
+        """Import the attack animation of the equipped melee weapon (must be called again whenever the melee weapon changes)."""
+        scene_conversion_table = {'day': 'day', 'night': 'night', 'dawn': 'dawn_dusk', 'dusk': 'dawn_dusk'}
+        full_path = self.base_path + self.character + '/attack' + self.game.selection['melee'].animation + '/' + scene_conversion_table[self.parent.scene]
+        self.attack_animation = frame_store.get(full_path)
+        self.mirrored_attack_animation = mirror_cache.get(full_path, self.attack_animation)
 
     def import_run_particles(self):
-        """Import the run particles."""
-        self.run_particles = import_folder('./assets/player/particles/run')
+        """Import the run particles for each facing."""
+        self.run_particles = frame_store.get('./assets/player/particles/run')
+        self.mirrored_run_particles = mirror_cache.get('./assets/player/particles/run', self.run_particles)
 
     def animate(self):
         """Animate the player and setup the player rect correctly."""
         if self.melee_attacking:
-            scene_conversion_table = {'day': 'day', 'night': 'night', 'dawn': 'dawn_dusk', 'dusk': 'dawn_dusk'}
-            animation = import_folder(self.base_path + self.character + '/attack' + self.game.selection['melee'].animation + '/' + scene_conversion_table[self.parent.scene])
+            animation = self.attack_animation if self.facing_right else self.mirrored_attack_animation
             self.animation_speed = self.game.selection['melee'].animation_speed
         else:
-            animation = self.player_assets[self.status]
+            animation = self.player_assets[self.status] if self.facing_right else self.mirrored_player_assets[self.status]
             self.animation_speed = 0.15 * (self.speed / self.base_speed)
         # Frame index loop
         self.frame_index += self.animation_speed*60*self.parent.delta
         if self.frame_index >= len(animation):
             self.frame_index = 0
 
-        image = animation[int(self.frame_index)]
+        self.image = animation[int(self.frame_index)]
         if self.facing_right:
-            self.image = image
             self.rect.bottomleft = self.collision_rect.bottomleft
             self.melee_weapon_rect.topleft = (self.rect.right, self.rect.top + self.game.selection['melee'].offset)
         else:
-            flipped_image = pygame.transform.flip(image, True, False)  # flip(image, X-axis, Y-axis)
-            self.image = flipped_image
             self.rect.bottomright = self.collision_rect.bottomright
             self.melee_weapon_rect.topright = (self.rect.left, self.rect.top + self.game.selection['melee'].offset)
 
-        # Sprite flickering
+        # Sprite flickering (the frames are shared, so the player is hidden when drawing instead of changing their alpha)
         alpha = self.get_flicker_status()
-        if self.invincible:
-            self.image.set_alpha(alpha)
-        else:
-            self.image.set_alpha(255)
+        self.visible = not self.invincible or alpha == 255
 
         if self.melee_attacking:
             self.rect = pygame.Rect(self.rect.topleft, (self.image.get_width() - self.game.selection['melee'].range, self.image.get_height()))
@@ -158,14 +164,14 @@ class Player(pygame.sprite.Sprite):
                 self.dust_frame_index = 0
 
             particle = self.run_particles[int(self.dust_frame_index)]
+            rect = self.parent.camera.apply(self.rect)  # The particles are drawn straight to the screen
 
             if self.facing_right:
-                pos = self.rect.bottomleft - pygame.Vector2(28, 32)
+                pos = rect.bottomleft - pygame.Vector2(28, 32)
                 self.display_surface.blit(particle, pos)
             else:
-                pos = self.rect.bottomright - pygame.Vector2(6, 32)
-                flipped_particle = pygame.transform.flip(particle, True, False)
-                self.display_surface.blit(flipped_particle, pos)
+                pos = rect.bottomright - pygame.Vector2(6, 32)
+                self.display_surface.blit(self.mirrored_run_particles[int(self.dust_frame_index)], pos)
 
     def get_input(self):
         """Get the input from the devices and do the correct actions."""
@@ -5,6 +5,13 @@ tile_size = 64
 
 screen_height = y_tiles * tile_size
 screen_width = 1280
+chunk_width = 16 * tile_size  # The width of the surfaces the static tiles are baked into
+cull_margin = 2 * tile_size  # How far outside the screen sprites are still drawn
+particle_pool_size = 16  # The largest number of particles which can exist at once in a level
+projectile_pool_size = 32  # The largest number of projectiles which are kept for reuse in a level
+text_layout_cache_size = 32  # The largest number of wrapped texts which are kept at once
+render_cache_size = 256  # The largest number of rendered text surfaces which are kept at once
+asset_memory_budget = 128 * 1024 * 1024  # The largest number of bytes the asset manager keeps in images, sounds and animations before evicting the least recently used ones
 
 # Controller mappings
 
@@ -1,14 +1,38 @@
 import pygame
+from collections import OrderedDict
+from settings import text_layout_cache_size
 
-"""A simple text wrapper derived from the one at https://www.pygame.org/wiki/TextWrap"""
+"""A simple text wrapper derived from the one at https://www.pygame.org/wiki/TextWrap, which keeps the lines it lays out so that the texts drawn every frame are only wrapped once."""
 
-def render(text, font, display_surface, rect, color, line_spacing=2, aa=False, bkg=None):
-    """Render some text.
+def find_line_break(text, font, width):
+    """Return the length of the start of some text which fits in a line, cut after its last whole word.
+
+    The first start of the text which is as wide as the line is found by binary search, as adding a character never makes a string narrower.
+
+    Arguments:
+    text -- the text to wrap
+    font -- the font object
+    width -- the width of the line
+    """
+    low = 1
+    high = len(text)
+    while low < high:
+        middle = (low + high) // 2
+        if font.size(text[:middle])[0] < width:
+            low = middle + 1
+        else:
+            high = middle
+    # if we've wrapped the text, then adjust the wrap to the last word
+    if low < len(text):
+        low = text.rfind(" ", 0, low) + 1
+    return low
+
+def layout(text, font, rect, color, line_spacing=2, aa=False, bkg=None):
+    """Render the lines of some text and return a list with their (image, position) pairs and the text which didn't fit in the rectangle.
 
     Arguments:
     text -- the text to render
     font -- the font object
-    display_surface -- the screen
     rect -- the bounding text rectangle
     color -- the text color
     line_spacing -- the pixels of spacing between lines
@@ -18,25 +42,87 @@ def render(text, font, display_surface, rect, color, line_spacing=2, aa=False, b
     rect = pygame.Rect(rect)
     y = rect.top
     font_height = font.size("Tg")[1]
+    lines = []
     while text:
-        i = 1
         # determine if the row of text will be outside our area
         if y + font_height > rect.bottom:
             break
-        # determine maximum width of line
-        while font.size(text[:i])[0] < rect.width and i < len(text):
-            i += 1
-        # if we've wrapped the text, then adjust the wrap to the last word
-        if i < len(text):
-            i = text.rfind(" ", 0, i) + 1
-        # render the line and blit it to the surface
-        if bkg:
-            image = font.render(text[:i], 1, color, bkg)
-            image.set_colorkey(bkg)
-        else:
-            image = font.render(text[:i], aa, color)
-        display_surface.blit(image, (rect.left, y))
+        i = find_line_break(text, font, rect.width)
+        # render the line (a word wider than the rectangle leaves an empty line)
+        if i > 0:
+            if bkg:
+                image = font.render(text[:i], 1, color, bkg)
+                image.set_colorkey(bkg)
+            else:
+                image = font.render(text[:i], aa, color)
+            lines.append((image, (rect.left, y)))
         y += font_height + line_spacing
-        # remove the text we just blitted
+        # remove the text we just rendered
         text = text[i:]
+    return lines, text
+
+class LayoutCache:
+    """The layout cache, which keeps the lines of the texts laid out most recently.
+
+    Only the most recently used layouts are kept, so texts which change every frame can't fill the memory.
+    """
+    def __init__(self, size):
+        """Setup the cache and its statistics.
+
+        Arguments:
+        size -- the largest number of layouts to keep
+        """
+        self.size = size
+        self.layouts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text, font, rect, color, line_spacing, aa, bkg):
+        """Return the lines of some text and the text which didn't fit, laying it out only if it isn't cached yet.
+
+        Arguments:
+        text -- the text to render
+        font -- the font object
+        rect -- the bounding text rectangle
+        color -- the text color
+        line_spacing -- the pixels of spacing between lines
+        aa -- antialiasing flag
+        bkg -- the background color
+        """
+        key = (font, text, tuple(pygame.Rect(rect)), tuple(pygame.Color(color)), line_spacing, aa, bkg if bkg is None else tuple(pygame.Color(bkg)))
+        if key in self.layouts:
+            self.hits += 1
+            self.layouts.move_to_end(key)
+        else:
+            self.misses += 1
+            self.layouts[key] = layout(text, font, rect, color, line_spacing, aa, bkg)
+            if len(self.layouts) > self.size:
+                self.layouts.popitem(last=False)
+        return self.layouts[key]
+
+    def clear(self):
+        """Remove every layout from the cache."""
+        self.layouts.clear()
+
+    def get_stats(self):
+        """Return a dictionary with the cache statistics."""
+        return {'hits': self.hits, 'misses': self.misses, 'layouts': len(self.layouts)}
+
+layout_cache = LayoutCache(text_layout_cache_size)
+
+def render(text, font, display_surface, rect, color, line_spacing=2, aa=False, bkg=None):
+    """Render some text.
+
+    Arguments:
+    text -- the text to render
+    font -- the font object
+    display_surface -- the screen
+    rect -- the bounding text rectangle
+    color -- the text color
+    line_spacing -- the pixels of spacing between lines
+    aa -- antialiasing flag
+    bkg -- the background color
+    """
+    lines, text = layout_cache.get(text, font, rect, color, line_spacing, aa, bkg)
+    display_surface.blits(lines, False)
     return text
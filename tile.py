@@ -1,5 +1,6 @@
 import pygame
-from misc import import_folder
+from cache import frame_store
+from assetmanager import asset_manager
 
 """This file contains the tile classes."""
 
@@ -17,14 +18,6 @@ class Tile(pygame.sprite.Sprite):
         self.image = pygame.Surface((size, size))
         self.rect = self.image.get_rect(topleft = (x, y))
 
-    def update(self, shift):
-        """Update the tile.
-
-        Arguments:
-        shift -- the camera shift
-        """
-        self.rect.x += shift
-
 class StaticTile(Tile):
     """The base static tile class."""
     def __init__(self, size, x, y, surface):
@@ -52,7 +45,7 @@ class Tree(StaticTile):
         path -- the tree image
         offset -- the tree image offset
         """
-        super().__init__(size, x, y, pygame.image.load(path).convert_alpha())
+        super().__init__(size, x, y, asset_manager.load_image(path))
         offset_y = y - offset
         self.rect.topleft = (x, offset_y)
 
@@ -68,7 +61,7 @@ class AnimatedTile(Tile):
         path -- the folder with all the animation frames
         """
         super().__init__(size, x, y)
-        self.frames = import_folder(path)
+        self.frames = frame_store.get(path)  # The frames are shared with every other sprite using the same folder
         self.frame_index = 0
         self.image = self.frames[self.frame_index]
         self.rect = self.image.get_rect(topleft = (x, y))
@@ -84,15 +77,13 @@ class AnimatedTile(Tile):
             self.frame_index = 0
         self.image = self.frames[int(self.frame_index)]
 
-    def update(self, shift, delta):
+    def update(self, delta):
         """Update the tile.
 
         Arguments:
-        shift -- the camera shift
         delta -- the time delta
         """
         self.animate(delta)
-        super().update(shift)
 
 class Energy(AnimatedTile):
     """A specialized AnimatedTile for the energy items."""
@@ -109,11 +100,46 @@ class Energy(AnimatedTile):
         super().__init__(size, x, y, path)
         self.value = value
 
-    def update(self, shift, delta):
+    def update(self, delta):
         """Update the energy tile.
 
         Arguments:
-        shift -- the camera shift
         delta -- the time delta
         """
-        super().update(shift, delta)
+        super().update(delta)
+
+class Chunk(StaticTile):
+    """A specialized StaticTile holding the static tiles of a slice of the level baked into a single surface."""
+    def __init__(self, rect, sprites):
+        """Initialize the parent StaticTile class and bake the sprites into its surface.
+
+        Arguments:
+        rect -- the part of the level covered by the chunk, cropped to the sprites it holds
+        sprites -- the sprites to bake, in drawing order
+        """
+        super().__init__(0, rect.x, rect.y, pygame.Surface(rect.size, pygame.SRCALPHA))
+        for sprite in sprites:
+            self.image.blit(sprite.image, sprite.rect.move(-rect.x, -rect.y))
+
+def bake_chunks(groups, chunk_width, chunk_height):
+    """Bake the sprites of several static groups into chunks and return a group with the chunks which aren't empty.
+
+    The sprites are sorted into the chunks they overlap in a single pass, and every chunk is cropped to the sprites it holds.
+
+    Arguments:
+    groups -- the groups to bake, in drawing order
+    chunk_width -- the width of every chunk
+    chunk_height -- the height of every chunk
+    """
+    buckets = {}  # The sprites overlapping every chunk, in drawing order, keyed by chunk index
+    for group in groups:
+        for sprite in group.sprites():
+            for index in range(sprite.rect.left // chunk_width, (sprite.rect.right - 1) // chunk_width + 1):
+                buckets.setdefault(index, []).append(sprite)
+    chunk_sprites = pygame.sprite.Group()
+    for index in sorted(buckets):
+        area = pygame.Rect(index * chunk_width, 0, chunk_width, chunk_height)
+        rects = [rect for rect in (sprite.rect.clip(area) for sprite in buckets[index]) if rect.width and rect.height]
+        if rects:
+            chunk_sprites.add(Chunk(rects[0].unionall(rects[1:]), buckets[index]))
+    return chunk_sprites
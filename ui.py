@@ -1,9 +1,16 @@
 import pygame
+from settings import screen_width, screen_height
+from cache import image_cache
+from assetmanager import asset_manager
+from fonts import font_registry, render_cache
 
 """This file defines the UI elements."""
 
 class UI:
-    """The main UI class."""
+    """The main UI class.
+
+    The UI is retained: the 'display_*' methods only store the values to show, and each element is drawn again into a single layer only when its own values change.
+    """
     def __init__(self, display_surface):
         """Prepare things for displaying the actual UI.
 
@@ -11,26 +18,157 @@ class UI:
         display_surface -- the screen
         """
         self.display_surface = display_surface
-        self.font = pygame.font.Font('./font.ttf', 20)
-        self.health_bar = pygame.image.load('./assets/ui/health_bar.png').convert_alpha()
+        self.layer = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
+        self.values = {}  # The values shown by each element in the current frame
+        self.layer_values = {}  # The values each element in the layer was drawn with
+        self.element_rects = {}  # The part of the layer covered by each element
+        self.dirty_frames = 0
+        self.clean_frames = 0
+        self.redrawn_elements = 0
+        self.font = font_registry.get('./font.ttf', 20)
+        self.ranged_projectile_count_font = font_registry.get('./font.ttf', 6)
+        self.layer_rect = pygame.Rect(0, 0, 0, 0)  # The part of the layer covered by the elements
+        self.health_bar = asset_manager.load_image('./assets/ui/health_bar.png')
         self.health_rect = self.health_bar.get_rect(topleft=(16, 16))
-        self.health_remainder_bar = pygame.image.load('./assets/ui/health_remainder_bar.png').convert_alpha()
+        self.health_remainder_bar = asset_manager.load_image('./assets/ui/health_remainder_bar.png')
         self.health_remainder_rect = self.health_remainder_bar.get_rect(topleft=(16, 144))
-        self.energy_bar = pygame.image.load('./assets/ui/energy_bar.png').convert_alpha()
+        self.energy_bar = asset_manager.load_image('./assets/ui/energy_bar.png')
         self.energy_rect = self.energy_bar.get_rect(topleft=(16, 80))
-        self.energy_overflow_bar = pygame.image.load('./assets/ui/energy_overflow_bar.png').convert_alpha()
+        self.energy_overflow_bar = asset_manager.load_image('./assets/ui/energy_overflow_bar.png')
         self.energy_overflow_rect = self.energy_overflow_bar.get_rect(topright=(self.energy_rect.right, 144))
-        self.stamina_bar = pygame.image.load('./assets/ui/stamina_bar.png').convert_alpha()
+        self.stamina_bar = asset_manager.load_image('./assets/ui/stamina_bar.png')
         self.stamina_rect = self.stamina_bar.get_rect(topleft=(16, 176))
-        self.melee_overlay = pygame.image.load('./assets/ui/overlay_melee.png').convert_alpha()
+        self.melee_overlay = asset_manager.load_image('./assets/ui/overlay_melee.png')
         self.melee_overlay_rect = self.melee_overlay.get_rect(bottomleft=(16, 688))
-        self.ranged_overlay = pygame.image.load('./assets/ui/overlay_ranged.png').convert_alpha()
+        self.ranged_overlay = asset_manager.load_image('./assets/ui/overlay_ranged.png')
         self.ranged_overlay_rect = self.ranged_overlay.get_rect(bottomleft=self.melee_overlay_rect.bottomright)
-        self.magical_overlay = pygame.image.load('./assets/ui/overlay_magical.png').convert_alpha()
+        self.magical_overlay = asset_manager.load_image('./assets/ui/overlay_magical.png')
         self.magical_overlay_rect = self.magical_overlay.get_rect(bottomleft=self.ranged_overlay_rect.bottomright)
 
     def display_health(self, health, max_health):
-        """Display the health bar and statistics.
+        """Show the health bar and statistics in the current frame.
+
+        Arguments:
+        health -- the current health value
+        max_health -- the maximum health value
+        """
+        self.values['health'] = (health, max_health)
+
+    def display_health_remainder(self, health_remainder, max_health_remainder):
+        """Show the health remainder bar and statistics in the current frame.
+
+        Arguments:
+        health_remainder -- the current health remainder value
+        max_health_remainder -- the maximum health remainder value
+        """
+        self.values['health_remainder'] = (health_remainder, max_health_remainder)
+
+    def display_energy(self, energy, max_energy):
+        """Show the energy bar and statistics in the current frame.
+
+        Arguments:
+        energy -- the current energy value
+        max_energy -- the maximum energy value
+        """
+        self.values['energy'] = (energy, max_energy)
+
+    def display_energy_overflow(self, energy_overflow, max_energy_overflow):
+        """Show the energy overflow bar and statistics in the current frame.
+
+        Arguments:
+        energy_overflow -- the current energy overflow value
+        max_energy_overflow -- the maximum energy overflow value
+        """
+        self.values['energy_overflow'] = (energy_overflow, max_energy_overflow)
+
+    def display_stamina(self, stamina, max_stamina):
+        """Show the stamina bar in the current frame.
+
+        Arguments:
+        stamina -- the current stamina value
+        max_stamina -- the maximum stamina value
+        """
+        self.values['stamina'] = (stamina, max_stamina)
+
+    def display_melee_overlay(self, melee_weapon, melee_durability, max_melee_durability):
+        """Show the melee weapon overlay in the current frame.
+
+        Arguments:
+        melee_weapon -- the path to the melee weapon icon
+        melee_durability -- the current melee weapon durability
+        max_melee_durability -- the maximum melee weapon durability
+        """
+        self.values['melee_overlay'] = (melee_weapon, melee_durability, max_melee_durability)
+
+    def display_ranged_overlay(self, ranged_weapon, ranged_projectile_count):
+        """Show the ranged weapon overlay in the current frame.
+
+        Arguments:
+        ranged_weapon -- the path to the ranged weapon icon
+        ranged_projectile_count -- the ranged projectile count
+        """
+        self.values['ranged_overlay'] = (ranged_weapon, ranged_projectile_count)
+
+    def display_magical_overlay(self, magical_weapon, magical_power, max_magical_power):
+        """Show the magical weapon overlay in the current frame.
+
+        Arguments:
+        magical_weapon -- the path to the magical weapon icon
+        magical_power -- the current magical weapon power
+        max_magical_power -- the maximum magical weapon power
+        """
+        self.values['magical_overlay'] = (magical_weapon, magical_power, max_magical_power)
+
+    def draw(self):
+        """Draw again into the UI layer the elements whose shown values changed, then draw the layer to screen (must be called every frame after the 'display_*' methods)."""
+        dirty = {element for element, values in self.values.items() if self.layer_values.get(element) != values}
+        dirty.update(element for element in self.layer_values if element not in self.values)
+        if dirty:
+            # The elements overlapping the ones being cleared are drawn again too, so that the elements still blend in the same order
+            areas = [self.element_rects[element] for element in dirty if element in self.element_rects]
+            overlapping = True
+            while overlapping:
+                overlapping = [element for element, rect in self.element_rects.items() if element not in dirty and rect.collidelist(areas) != -1]
+                dirty.update(overlapping)
+                areas += [self.element_rects[element] for element in overlapping]
+            self.draw_elements(dirty, areas)
+            # If an element grew over one which wasn't drawn again, the whole layer is drawn again
+            others = [rect for element, rect in self.element_rects.items() if element not in dirty]
+            if any(self.element_rects[element].collidelist(others) != -1 for element in dirty if element in self.element_rects):
+                dirty = set(self.values)
+                self.draw_elements(dirty, [self.layer.get_rect()])
+            rects = list(self.element_rects.values())
+            self.layer_rect = rects[0].unionall(rects[1:]) if rects else pygame.Rect(0, 0, 0, 0)
+            self.layer_values = self.values
+            self.dirty_frames += 1
+            self.redrawn_elements += len(dirty)
+        else:
+            self.clean_frames += 1
+        # The layer is blitted once, as blitting every element rect would blend their overlapping pixels more than once
+        self.display_surface.blit(self.layer, self.layer_rect, self.layer_rect)
+        self.values = {}
+
+    def draw_elements(self, elements, areas):
+        """Clear some areas of the UI layer, then draw some elements into it with the values shown in the current frame.
+
+        Arguments:
+        elements -- the elements to draw
+        areas -- the rects to clear
+        """
+        for area in areas:
+            self.layer.fill((0, 0, 0, 0), area)
+        for element in elements:
+            self.element_rects.pop(element, None)
+        for element, values in self.values.items():
+            if element in elements:
+                self.element_rects[element] = getattr(self, f'draw_{element}')(*values)
+
+    def get_stats(self):
+        """Return a dictionary with the number of frames in which some UI elements were drawn again (dirty) or none was (clean), and the number of elements drawn again."""
+        return {'dirty': self.dirty_frames, 'clean': self.clean_frames, 'redrawn': self.redrawn_elements}
+
+    def draw_health(self, health, max_health):
+        """Draw into the UI layer the health bar and statistics, then return the rect covered.
 
         Arguments:
         health -- the current health value
@@ -41,17 +179,18 @@ class UI:
         health_bar_width = 200
         health_bar_height = 12
         # Drawing
-        self.display_surface.blit(self.health_bar, self.health_rect)
-        health_statistics_surface = self.font.render(f'{health} / {max_health}', False, 'white')  # self.font.render(text, antialiasing, color)
+        self.layer.blit(self.health_bar, self.health_rect)
+        health_statistics_surface = render_cache.render(self.font, f'{health} / {max_health}', False, 'white')
         health_statistics_rect = health_statistics_surface.get_rect(midleft=(self.health_rect.right+8, self.health_rect.centery))
-        self.display_surface.blit(health_statistics_surface, health_statistics_rect)
+        self.layer.blit(health_statistics_surface, health_statistics_rect)
         health_percentage = health / max_health
         health_width = int(health_bar_width * health_percentage)
         health_bar_rect = pygame.Rect(health_bar_topleft, (health_width, health_bar_height))
-        pygame.draw.rect(self.display_surface, '#dc4949', health_bar_rect)
+        pygame.draw.rect(self.layer, '#dc4949', health_bar_rect)
+        return self.health_rect.unionall([health_statistics_rect, health_bar_rect])
 
-    def display_health_remainder(self, health_remainder, max_health_remainder):
-        """Display the health remainder bar and statistics.
+    def draw_health_remainder(self, health_remainder, max_health_remainder):
+        """Draw into the UI layer the health remainder bar and statistics, then return the rect covered.
 
         Arguments:
         health_remainder -- the current health remainder value
@@ -62,20 +201,21 @@ class UI:
         health_remainder_bar_width = 112
         health_remainder_bar_height = 12
         # Drawing
-        self.display_surface.blit(self.health_remainder_bar, self.health_remainder_rect)
-        health_remainder_statistics_surface = self.font.render(f'{health_remainder}', False, 'white')
+        self.layer.blit(self.health_remainder_bar, self.health_remainder_rect)
+        health_remainder_statistics_surface = render_cache.render(self.font, f'{health_remainder}', False, 'white')
         health_remainder_statistics_rect = health_remainder_statistics_surface.get_rect(midleft=(self.health_remainder_rect.right+8, self.health_remainder_rect.centery))
-        self.display_surface.blit(health_remainder_statistics_surface, health_remainder_statistics_rect)
+        self.layer.blit(health_remainder_statistics_surface, health_remainder_statistics_rect)
         if health_remainder == 0:
             health_remainder_percentage = 1  # If the health remainder is 0, show the bar as full instead of empty
         else:
             health_remainder_percentage = health_remainder / max_health_remainder
         health_remainder_width = int(health_remainder_bar_width * health_remainder_percentage)
         health_remainder_bar_rect = pygame.Rect(health_remainder_bar_topleft, (health_remainder_width, health_remainder_bar_height))
-        pygame.draw.rect(self.display_surface, '#dc4949', health_remainder_bar_rect)
+        pygame.draw.rect(self.layer, '#dc4949', health_remainder_bar_rect)
+        return self.health_remainder_rect.unionall([health_remainder_statistics_rect, health_remainder_bar_rect])
 
-    def display_energy(self, energy, max_energy):
-        """Display the energy bar and statistics.
+    def draw_energy(self, energy, max_energy):
+        """Draw into the UI layer the energy bar and statistics, then return the rect covered.
 
         Arguments:
         energy -- the current energy value
@@ -86,17 +226,18 @@ class UI:
         energy_bar_width = 200
         energy_bar_height = 12
         # Drawing
-        self.display_surface.blit(self.energy_bar, self.energy_rect)
-        energy_statistics_surface = self.font.render(f'{energy} / {max_energy}', False, 'white')
+        self.layer.blit(self.energy_bar, self.energy_rect)
+        energy_statistics_surface = render_cache.render(self.font, f'{energy} / {max_energy}', False, 'white')
         energy_statistics_rect = energy_statistics_surface.get_rect(midleft=(self.energy_rect.right+8, self.energy_rect.centery))
-        self.display_surface.blit(energy_statistics_surface, energy_statistics_rect)
+        self.layer.blit(energy_statistics_surface, energy_statistics_rect)
         energy_percentage = energy / max_energy
         energy_width = int(energy_bar_width * energy_percentage)
         energy_bar_rect = pygame.Rect(energy_bar_topleft, (energy_width, energy_bar_height))
-        pygame.draw.rect(self.display_surface, '#0098db', energy_bar_rect)
+        pygame.draw.rect(self.layer, '#0098db', energy_bar_rect)
+        return self.energy_rect.unionall([energy_statistics_rect, energy_bar_rect])
 
-    def display_energy_overflow(self, energy_overflow, max_energy_overflow):
-        """Display the energy overflow bar and statistics.
+    def draw_energy_overflow(self, energy_overflow, max_energy_overflow):
+        """Draw into the UI layer the energy overflow bar and statistics, then return the rect covered.
 
         Arguments:
         energy_overflow -- the current energy overflow value
@@ -107,17 +248,18 @@ class UI:
         energy_overflow_bar_width = 52
         energy_overflow_bar_height = 12
         # Drawing
-        self.display_surface.blit(self.energy_overflow_bar, self.energy_overflow_rect)
-        energy_overflow_statistics_surface = self.font.render(f'{energy_overflow}', False, 'white')
+        self.layer.blit(self.energy_overflow_bar, self.energy_overflow_rect)
+        energy_overflow_statistics_surface = render_cache.render(self.font, f'{energy_overflow}', False, 'white')
         energy_overflow_statistics_rect = energy_overflow_statistics_surface.get_rect(midleft=(self.energy_overflow_rect.right+8, self.energy_overflow_rect.centery))
-        self.display_surface.blit(energy_overflow_statistics_surface, energy_overflow_statistics_rect)
+        self.layer.blit(energy_overflow_statistics_surface, energy_overflow_statistics_rect)
         energy_overflow_percentage = energy_overflow / max_energy_overflow
         energy_overflow_width = int(energy_overflow_bar_width * energy_overflow_percentage)
         energy_overflow_bar_rect = pygame.Rect(energy_overflow_bar_topleft, (energy_overflow_width, energy_overflow_bar_height))
-        pygame.draw.rect(self.display_surface, '#0098db', energy_overflow_bar_rect)
+        pygame.draw.rect(self.layer, '#0098db', energy_overflow_bar_rect)
+        return self.energy_overflow_rect.unionall([energy_overflow_statistics_rect, energy_overflow_bar_rect])
 
-    def display_stamina(self, stamina, max_stamina):
-        """Display the stamina bar.
+    def draw_stamina(self, stamina, max_stamina):
+        """Draw into the UI layer the stamina bar, then return the rect covered.
 
         Arguments:
         stamina -- the current stamina value
@@ -128,58 +270,100 @@ class UI:
         stamina_bar_width = 200
         stamina_bar_height = 12
         # Drawing
-        self.display_surface.blit(self.stamina_bar, self.stamina_rect)
+        self.layer.blit(self.stamina_bar, self.stamina_rect)
         stamina_percentage = stamina / max_stamina
         stamina_width = int(stamina_bar_width * stamina_percentage)
         stamina_bar_rect = pygame.Rect(stamina_bar_topleft, (stamina_width, stamina_bar_height))
-        pygame.draw.rect(self.display_surface, '#aeda48', stamina_bar_rect)
+        pygame.draw.rect(self.layer, '#aeda48', stamina_bar_rect)
+        return self.stamina_rect.union(stamina_bar_rect)
 
-    def display_melee_overlay(self, melee_weapon, melee_durability, max_melee_durability):
-        """Display the melee weapon overlay.
+    def draw_melee_overlay(self, melee_weapon, melee_durability, max_melee_durability):
+        """Draw into the UI layer the melee weapon overlay, then return the rect covered.
 
         Arguments:
         melee_weapon -- the path to the melee weapon icon
         melee_durability -- the current melee weapon durability
         max_melee_durability -- the maximum melee weapon durability
         """
-        melee_weapon_icon = pygame.image.load(melee_weapon).convert_alpha()
+        melee_weapon_icon = image_cache.get(melee_weapon)
         melee_weapon_icon_rect = melee_weapon_icon.get_rect(center=self.melee_overlay_rect.center)
-        self.display_surface.blit(self.melee_overlay, self.melee_overlay_rect)
-        self.display_surface.blit(melee_weapon_icon, melee_weapon_icon_rect)
+        self.layer.blit(self.melee_overlay, self.melee_overlay_rect)
+        self.layer.blit(melee_weapon_icon, melee_weapon_icon_rect)
         melee_durability_percentage = melee_durability / max_melee_durability
         melee_durability_width = int(48 * melee_durability_percentage)
         melee_durability_rect = pygame.Rect((self.melee_overlay_rect.topleft[0]+5, self.melee_overlay_rect.topleft[1]+72), (melee_durability_width, 4))
-        pygame.draw.rect(self.display_surface, '#14a02e', melee_durability_rect)
+        pygame.draw.rect(self.layer, '#14a02e', melee_durability_rect)
+        return self.melee_overlay_rect.unionall([melee_weapon_icon_rect, melee_durability_rect])
 
-    def display_ranged_overlay(self, ranged_weapon, ranged_projectile_count):
-        """Display the ranged weapon overlay.
+    def draw_ranged_overlay(self, ranged_weapon, ranged_projectile_count):
+        """Draw into the UI layer the ranged weapon overlay, then return the rect covered.
 
         Arguments:
         ranged_weapon -- the path to the ranged weapon icon
         ranged_projectile_count -- the ranged projectile count
         """
-        ranged_weapon_icon = pygame.image.load(ranged_weapon).convert_alpha()
+        ranged_weapon_icon = image_cache.get(ranged_weapon)
         ranged_weapon_icon_rect = ranged_weapon_icon.get_rect(center=self.ranged_overlay_rect.center)
-        self.display_surface.blit(self.ranged_overlay, self.ranged_overlay_rect)
-        self.display_surface.blit(ranged_weapon_icon, ranged_weapon_icon_rect)
-        ranged_projectile_count_font = pygame.font.Font('./font.ttf', 6)
-        ranged_projectile_count_surface = ranged_projectile_count_font.render(str(ranged_projectile_count), False, 'white')
+        self.layer.blit(self.ranged_overlay, self.ranged_overlay_rect)
+        self.layer.blit(ranged_weapon_icon, ranged_weapon_icon_rect)
+        ranged_projectile_count_surface = render_cache.render(self.ranged_projectile_count_font, str(ranged_projectile_count), False, 'white')
         ranged_projectile_count_rect = ranged_projectile_count_surface.get_rect(bottomleft=(self.ranged_overlay_rect.left+4, self.ranged_overlay_rect.bottom-4))
-        self.display_surface.blit(ranged_projectile_count_surface, ranged_projectile_count_rect)
+        self.layer.blit(ranged_projectile_count_surface, ranged_projectile_count_rect)
+        return self.ranged_overlay_rect.unionall([ranged_weapon_icon_rect, ranged_projectile_count_rect])
 
-    def display_magical_overlay(self, magical_weapon, magical_power, max_magical_power):
-        """Display the magical weapon overlay.
+    def draw_magical_overlay(self, magical_weapon, magical_power, max_magical_power):
+        """Draw into the UI layer the magical weapon overlay, then return the rect covered.
 
         Arguments:
         magical_weapon -- the path to the magical weapon icon
         magical_power -- the current magical weapon power
         max_magical_power -- the maximum magical weapon power
         """
-        magical_weapon_icon = pygame.image.load(magical_weapon).convert_alpha()
+        magical_weapon_icon = image_cache.get(magical_weapon)
         magical_weapon_icon_rect = magical_weapon_icon.get_rect(center=self.magical_overlay_rect.center)
-        self.display_surface.blit(self.magical_overlay, self.magical_overlay_rect)
-        self.display_surface.blit(magical_weapon_icon, magical_weapon_icon_rect)
+        self.layer.blit(self.magical_overlay, self.magical_overlay_rect)
+        self.layer.blit(magical_weapon_icon, magical_weapon_icon_rect)
         magical_power_percentage = magical_power / max_magical_power
         magical_power_width = int(48 * magical_power_percentage)
         magical_power_rect = pygame.Rect((self.magical_overlay_rect.topleft[0]+5, self.magical_overlay_rect.topleft[1]+72), (magical_power_width, 4))
-        pygame.draw.rect(self.display_surface, '#ffe320', magical_power_rect)
+        pygame.draw.rect(self.layer, '#ffe320', magical_power_rect)
+        return self.magical_overlay_rect.unionall([magical_weapon_icon_rect, magical_power_rect])
+
+class DebugOverlay:
+    """The debug overlay, which shows the asset manager and text cache statistics in the top right corner of the screen."""
+    def __init__(self, display_surface):
+        """Setup the overlay, hidden.
+
+        Arguments:
+        display_surface -- the screen
+        """
+        self.display_surface = display_surface
+        self.font = font_registry.get('./font.ttf', 12)
+        self.visible = False
+
+    def toggle(self):
+        """Show the overlay if it is hidden, hide it otherwise."""
+        self.visible = not self.visible
+
+    def draw(self):
+        """Draw the overlay to screen if it is visible (must be called every frame after everything else)."""
+        if not self.visible:
+            return
+        assets = asset_manager.get_stats()
+        text = render_cache.get_stats()
+        lines = [
+            f"Assets: {assets['assets']} resident, {assets['loads']} loads, {assets['hits']} hits, {assets['evictions']} evictions, {assets['revivals']} revivals",
+            f"Memory: {assets['resident_bytes']/1048576:.1f} / {assets['budget']/1048576:.0f} MB, {assets['evicted_bytes']/1048576:.1f} MB evicted but in use",
+            f"Text renders: {text['hits']} hits, {text['misses']} misses ({text['hit_rate']:.0%})"
+        ]
+        # The statistics change every frame, so they are rendered directly instead of filling the render cache
+        surfaces = [self.font.render(line, False, 'white') for line in lines]
+        width = max(surface.get_width() for surface in surfaces)
+        height = surfaces[0].get_height()
+        background_rect = pygame.Rect(0, 0, width + 16, height * len(lines) + 8)
+        background_rect.topright = (screen_width, 0)
+        pygame.draw.rect(self.display_surface, 'black', background_rect)
+        y = background_rect.top + 4
+        for surface in surfaces:
+            self.display_surface.blit(surface, surface.get_rect(topright=(background_rect.right - 8, y)))
+            y += height
@@ -4,6 +4,7 @@ import configparser
 import pygame
 import sys
 import os
+from fonts import font_registry, render_cache
 
 """This file defines some functions used for various tasks involved with updating."""
 
@@ -64,7 +65,7 @@ def show_banner(version, display_surface):
     version -- the latest version
     display_surface -- the screen
     """
-    font = pygame.font.Font('./font.ttf', 18)
+    font = font_registry.get('./font.ttf', 18)
     text = [
         "Update available!",
         f"Latest version: {version}",
@@ -76,7 +77,7 @@ def show_banner(version, display_surface):
     display_surface.fill('black')
     y = 256
     for string in text:
-        surface = font.render(string, False, 'white')
+        surface = render_cache.render(font, string, False, 'white')
         rect = surface.get_rect(midtop=(display_surface.get_rect().centerx, y))
         display_surface.blit(surface, rect)
         y += 32
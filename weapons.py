@@ -1,4 +1,5 @@
 import pygame
+from cache import image_cache
 
 """This file defines the weapon classes."""
 
@@ -137,7 +138,7 @@ class RangedProjectilePack:
 
 class Projectile(pygame.sprite.Sprite):
     """The projectile class."""
-    def __init__(self, image, pos, speed, facing_right, start_x, run_code_on_impact=False):
+    def __init__(self, image, pos, speed, facing_right, run_code_on_impact=False):
         """Initialize the projectile.
 
         Arguments:
@@ -145,28 +146,107 @@ class Projectile(pygame.sprite.Sprite):
         pos -- the position at which the sprite spawns
         speed -- the speed at which the sprite travels
         facing_right -- whether the player is facing right when the projectile spawns
-        start_x -- the starting absolute X position
         run_code_on_impact -- whether to run code on impact with enemies (only used by magical weapons)
         """
         super().__init__()
-        self.image = pygame.image.load(image).convert_alpha()
+        self.pool = None  # The pool the projectile is handed back to when it is killed
+        self.reset(image, pos, speed, facing_right, run_code_on_impact)
+
+    def reset(self, image, pos, speed, facing_right, run_code_on_impact=False):
+        """Setup the projectile again, so that the sprite can be reused.
+
+        Arguments:
+        image -- the path to the projectile image
+        pos -- the position at which the sprite spawns
+        speed -- the speed at which the sprite travels
+        facing_right -- whether the player is facing right when the projectile spawns
+        run_code_on_impact -- whether to run code on impact with enemies (only used by magical weapons)
+        """
+        self.image = image_cache.get(image, not facing_right)
         self.rect = self.image.get_rect(midleft=pos)
         self.speed = speed
         self.facing_right = facing_right
-        if not self.facing_right:
-            self.image = pygame.transform.flip(self.image, True, False)
-        self.start_x = start_x
+        self.start_x = pos[0]  # The projectile keeps its world position, so this is where its range is measured from
+        self.previous_pos = self.rect.topleft  # The world position the projectile moved from in the last update
         self.run_code_on_impact = run_code_on_impact
 
-    def update(self, shift, delta):
+    def kill(self):
+        """Remove the projectile from every group and hand it back to its pool, if it has one."""
+        if self.alive():
+            super().kill()
+            if self.pool is not None:
+                self.pool.release(self)
+
+    def update(self, delta):
         """Update the projectile.
 
         Arguments:
-        shift -- the camera shift
         delta -- the time delta
         """
-        self.rect.x += shift
+        self.previous_pos = self.rect.topleft
         if self.facing_right:
             self.rect.x += self.speed*60*delta
         else:
             self.rect.x -= self.speed*60*delta
+
+class ProjectilePool:
+    """The projectile pool, which reuses the projectile sprites instead of creating a new one for every shot.
+
+    A projectile is handed back to the pool when it is killed, but it can only be reused from the next frame, so the collision checks still handling it see it unchanged.
+    Only a limited number of projectiles is kept: when all of them are in use, the extra projectiles are created without being kept.
+    """
+    def __init__(self, size):
+        """Setup the pool and its statistics.
+
+        Arguments:
+        size -- the largest number of projectiles to keep
+        """
+        self.size = size
+        self.kept = 0
+        self.free = []  # The projectiles which can be reused
+        self.released = []  # The projectiles killed in the current frame
+        self.created = 0
+        self.reused = 0
+        self.overflowed = 0
+
+    def get(self, image, pos, speed, facing_right, run_code_on_impact=False):
+        """Return a projectile ready to be added to a group.
+
+        Arguments:
+        image -- the path to the projectile image
+        pos -- the position at which the sprite spawns
+        speed -- the speed at which the sprite travels
+        facing_right -- whether the player is facing right when the projectile spawns
+        run_code_on_impact -- whether to run code on impact with enemies (only used by magical weapons)
+        """
+        if self.free:
+            projectile = self.free.pop()
+            projectile.reset(image, pos, speed, facing_right, run_code_on_impact)
+            self.reused += 1
+            return projectile
+        projectile = Projectile(image, pos, speed, facing_right, run_code_on_impact)
+        self.created += 1
+        if self.kept < self.size:
+            projectile.pool = self
+            self.kept += 1
+        else:
+            self.overflowed += 1
+        return projectile
+
+    def release(self, projectile):
+        """Hand a killed projectile back to the pool.
+
+        Arguments:
+        projectile -- the projectile
+        """
+        self.released.append(projectile)
+
+    def collect(self):
+        """Make the projectiles killed in the previous frame reusable (must be called once every frame, before any projectile is created)."""
+        if self.released:
+            self.free.extend(self.released)
+            self.released.clear()
+
+    def get_stats(self):
+        """Return a dictionary with the pool statistics."""
+        return {'size': self.size, 'kept': self.kept, 'free': len(self.free), 'created': self.created, 'reused': self.reused, 'overflowed': self.overflowed}
@@ -1,6 +1,8 @@
 import pygame
 from settings import controllers
 from data import levels
+from cache import image_cache
+from assetmanager import asset_manager
 
 """This file defines the level selection screen."""
 
@@ -13,10 +15,10 @@ class Node(pygame.sprite.Sprite):
         pos -- the position of the node
         unlocked -- the node will appear as unlocked only if this flag is set to True
         movement_speed -- the speed at which the level selector travels
-        image -- the path to the node graphics
+        image -- the node graphics (already filled with black if the node is locked)
         """
         super().__init__()
-        self.image = pygame.image.load(image).convert_alpha()
+        self.image = image
         if unlocked:
             self.status = 'unlocked'
         else:
@@ -25,13 +27,6 @@ class Node(pygame.sprite.Sprite):
         self.rect = self.image.get_rect(center = pos)
         self.target_rect = pygame.Rect(self.rect.centerx - (movement_speed / 2), self.rect.centery - (movement_speed / 2), movement_speed, movement_speed)
 
-    def update(self):
-        """Update the node based on its status."""
-        if self.status == 'locked':  # Fill the node with black
-            copy = self.image.copy()
-            copy.fill('black', None, pygame.BLEND_RGBA_MULT)
-            self.image.blit(copy, (0, 0))
-
 class LevelSelector(pygame.sprite.Sprite):
     """The level selector class."""
     def __init__(self, pos):
@@ -42,7 +37,7 @@ class LevelSelector(pygame.sprite.Sprite):
         """
         super().__init__()
         self.pos = pos
-        self.image = pygame.image.load('./assets/world/cross.png').convert_alpha()
+        self.image = image_cache.get('./assets/world/cross.png')
         self.rect = self.image.get_rect(center = pos)
 
     def update(self):
@@ -54,6 +49,8 @@ class World:
     def __init__(self, start_level, end_level, current_subpart, current_part, display_surface, parent):
         """Setup the level selector screen, the movement of the cursor and the sprites.
 
+        The world is built once and then reused, so everything which depends on the position on the map is set in 'setup'.
+
         Arguments:
         start_level -- the level to place the cursor on
         end_level -- the highest level the player can select
@@ -67,21 +64,38 @@ class World:
         self.parent = parent
         self.controllers = self.parent.controller.controllers
         self.gamepad = self.parent.gamepad
+        self.create_level = self.parent.create_level
+        self.prefetcher = self.parent.prefetcher
+        self.now = 0  # This is a dummy value
+        self.locked_node_images = {}
+        self.map_surface = pygame.Surface(self.display_surface.get_size(), pygame.SRCALPHA)
+
+        # SFX
+        self.menu_sfx = asset_manager.load_sound('./assets/audio/sfx/menu_select.ogg')
+
+        # Movement logic
+        self.movement_speed = 12
+
+        self.setup(start_level, end_level, current_subpart, current_part)
+
+    def setup(self, start_level, end_level, current_subpart, current_part):
+        """Place the level selector and create the sprites for a position on the map.
+
+        Arguments:
+        start_level -- the level to place the cursor on
+        end_level -- the highest level the player can select
+        current_subpart -- the subpart to load
+        current_part -- the part to load
+        """
         self.current_level = start_level
         self.end_level = end_level
         self.current_subpart = current_subpart
         self.current_part = current_part
-        self.create_level = self.parent.create_level
-        self.background = pygame.image.load(levels[self.current_part]['background']).convert_alpha()
-        self.now = 0  # This is a dummy value
+        self.background = image_cache.get(levels[self.current_part]['background'])
         self.gen_time = pygame.time.get_ticks()
 
-        # SFX
-        self.menu_sfx = pygame.mixer.Sound('./assets/audio/sfx/menu_select.ogg')
-
         # Movement logic
         self.movement_direction = pygame.Vector2(0, 0)
-        self.movement_speed = 12
         self.moving = False
 
         # Sprites
@@ -93,23 +107,45 @@ class World:
         # pygame.mixer.music.set_volume(0.5)
         # pygame.mixer.music.play(-1, fade_ms=2000)
 
+    def get_locked_node_image(self, path):
+        """Return the graphics of a locked node, filling them with black only the first time.
+
+        Arguments:
+        path -- the path to the node graphics
+        """
+        if path not in self.locked_node_images:
+            image = image_cache.get(path).copy()
+            copy = image.copy()
+            copy.fill('black', None, pygame.BLEND_RGBA_MULT)
+            image.blit(copy, (0, 0))
+            self.locked_node_images[path] = image
+        return self.locked_node_images[path]
+
     def setup_nodes(self):
-        """Create and place the nodes."""
+        """Create and place the nodes, then draw the map again."""
         self.nodes = pygame.sprite.Group()
         for index, node in enumerate(levels[self.current_part][self.current_subpart].values()):
             if isinstance(node, dict):
                 if index <= self.end_level:
-                    node_sprite = Node(node['node_pos'], True, self.movement_speed, node['node_graphics'])
+                    node_sprite = Node(node['node_pos'], True, self.movement_speed, image_cache.get(node['node_graphics']))
                     self.nodes.add(node_sprite)
                 else:
-                    node_sprite = Node(node['node_pos'], False, self.movement_speed, node['node_graphics'])
+                    node_sprite = Node(node['node_pos'], False, self.movement_speed, self.get_locked_node_image(node['node_graphics']))
                     self.nodes.add(node_sprite)
+        self.draw_map()
 
     def draw_paths(self):
         """Draw the lines joining the nodes together."""
         if len(levels[self.current_part][self.current_subpart]) > 1:
             points = [node['node_pos'] for index, node in enumerate(levels[self.current_part][self.current_subpart].values()) if index <= self.end_level + 1 and isinstance(node, dict)]
-            pygame.draw.lines(self.display_surface, '#daab76', False, points, 6)
+            pygame.draw.lines(self.map_surface, '#daab76', False, points, 6)
+
+    def draw_map(self):
+        """Draw the background, the paths and the nodes into the map surface, which only changes when the nodes do."""
+        self.map_surface.fill((0, 0, 0, 0))
+        self.map_surface.blit(self.background, (0, 0))
+        self.draw_paths()
+        self.nodes.draw(self.map_surface)
 
     def setup_level_selector(self):
         """Create the level selector sprite."""
@@ -117,6 +153,14 @@ class World:
         level_selector_sprite = LevelSelector(self.nodes.sprites()[self.current_level].rect.center)
         self.level_selector.add(level_selector_sprite)
 
+    def prefetch_level(self):
+        """Prefetch the level the level selector is resting on, cancelling the prefetch as soon as it moves."""
+        if self.moving:
+            self.prefetcher.cancel()
+        else:
+            level_data = levels[self.current_part][self.current_subpart][self.current_level]
+            self.prefetcher.prefetch(level_data, self.current_level, self.current_subpart, self.current_part)
+
     def update_level_selector(self):
         """Update the level selector."""
         if self.moving and self.movement_direction:
@@ -185,13 +229,10 @@ class World:
     def run(self):
         """Run the level selector, update and draw everything (must be called every frame)."""
         self.now = pygame.time.get_ticks()
-        self.background = pygame.image.load(levels[self.current_part]['background']).convert_alpha()
-        self.display_surface.blit(self.background, (0, 0))
         if self.now - self.gen_time >= 250:
             self.get_input()
         self.update_level_selector()
+        self.prefetch_level()
         self.level_selector.update()
-        self.draw_paths()
-        self.nodes.update()
-        self.nodes.draw(self.display_surface)
+        self.display_surface.blit(self.map_surface, (0, 0))
         self.level_selector.draw(self.display_surface)